@@ -0,0 +1,121 @@
+"""
+Launcher for the BAS demos.
+
+    python BAS                       list the demos
+    python BAS edge-on               run one demo
+    python BAS dipper --backend TkAgg
+    python BAS --warm                preload numpy, matplotlib and every demo
+                                     script once, then start demos on request
+
+Nothing heavy is imported until a demo is actually started, and the
+matplotlib backend is fixed before matplotlib is first imported. In --warm
+mode the preloaded interpreter forks a fresh child per demo (on platforms
+without fork, a new interpreter is started instead), so each demo gets a
+clean pyplot state while skipping the import cost.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from demos import DEMOS, load_script, run_demo
+
+
+def list_demos():
+    width = max(len(name) for name in DEMOS)
+    for name, (filename, entry_point, description) in DEMOS.items():
+        print(f"  {name:{width}s}  {description}  ({filename}: {entry_point})")
+
+
+def choose_backend(backend):
+    """Fix the backend before matplotlib is imported (MPLBACKEND is read on import)."""
+    if backend:
+        if "matplotlib" in sys.modules:
+            import matplotlib
+            matplotlib.use(backend)
+        else:
+            os.environ["MPLBACKEND"] = backend
+
+
+def preload():
+    """Import the heavy modules and every demo script; returns the seconds it took."""
+    start = time.perf_counter()
+    import numpy  # noqa: F401
+    import matplotlib.pyplot  # noqa: F401
+    import matplotlib.animation  # noqa: F401
+    for filename in sorted({filename for filename, _, _ in DEMOS.values()}):
+        load_script(filename)
+    return time.perf_counter() - start
+
+
+def launch(name):
+    """Run a demo in a child of this (preloaded) process and wait for it to finish."""
+    if not hasattr(os, "fork"):
+        subprocess.run([sys.executable, os.path.dirname(os.path.abspath(__file__)), name])
+        return
+
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            run_demo(name)
+        except BaseException as exc:
+            if not isinstance(exc, (KeyboardInterrupt, SystemExit)):
+                print(f"{name} failed: {exc!r}", file=sys.stderr)
+                status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    while True:
+        try:
+            os.waitpid(pid, 0)
+            return
+        except KeyboardInterrupt:
+            continue  # Ctrl+C also reached the child; wait for it to close
+
+
+def warm_session():
+    seconds = preload()
+    print(f"Preloaded in {seconds:.2f} s. Type a demo name, 'list', or 'quit'.")
+    while True:
+        try:
+            name = input("demo> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        if name in ("quit", "exit", "q"):
+            return
+        if name in ("list", "ls", "?", ""):
+            list_demos()
+        elif name in DEMOS:
+            launch(name)
+        else:
+            print(f"Unknown demo {name!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python BAS", description="Launch a BAS demo.")
+    parser.add_argument("demo", nargs="?", choices=list(DEMOS), help="demo to run (omit to list them)")
+    parser.add_argument("--backend", help="matplotlib backend, e.g. TkAgg, QtAgg, MacOSX")
+    parser.add_argument("--warm", action="store_true",
+                        help="preload everything, then launch demos from a prompt")
+    args = parser.parse_args()
+
+    choose_backend(args.backend)
+    if args.warm:
+        if args.demo:
+            preload()
+            launch(args.demo)
+        warm_session()
+    elif args.demo:
+        run_demo(args.demo)
+    else:
+        print("Available demos (python BAS <name>):")
+        list_demos()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Fast RA/Dec (ICRS / J2000) to altitude/azimuth for many objects and times.
+
+Everything that depends only on the time grid and the observer is computed
+once per grid and kept in an AltAzFrame:
+
+    * Greenwich apparent sidereal time (GMST plus the equation of the
+      equinoxes) and the local sidereal time,
+    * one 3x3 matrix per time: precession (IAU 1976) and nutation (main
+      terms) to the true equator of date, rotation by the local sidereal
+      time, and the tilt to the observer's horizon, rows = (north, east, up),
+    * the annual aberration vector (Earth's velocity / c) per time.
+
+Converting n objects then is matrix products of their (n, 3) unit vectors
+with those matrices: sin(altitude) for all times and objects needs two
+(n, 3) x (3, n_times) products and no trigonometry at all, which is what
+visibility planning needs. Azimuth adds two more products and an arctan2.
+
+Neglected (each well under an arcsecond, except UT1 - UTC): diurnal
+aberration, polar motion, frame bias, light deflection, and the smaller
+nutation terms. No refraction is applied (as astropy with pressure = 0).
+Times are UTC; pass dut1 = UT1 - UTC in seconds when it matters (up to
+0.9 s, i.e. up to ~14 arcsec in hour angle). check_against_astropy() bounds
+the error against astropy's SkyCoord / AltAz (run by test_altaz.py).
+
+Example:
+    python altaz.py --objects 1000000 --times 1000
+    python altaz.py --check
+"""
+import argparse
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from galaxy_catalog import radec_to_unit
+
+ARCSEC = np.pi / (180.0 * 3600.0)
+J2000 = 2451545.0
+TT_MINUS_UTC = 69.184            # seconds, TAI - UTC = 37 s since 2017 plus 32.184 s
+ABERRATION_CONSTANT = 20.49552 * ARCSEC
+
+
+def julian_date(times):
+    """Julian dates from numpy datetime64 values (or strings); floats pass through as JD."""
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.number):
+        return times.astype(float)
+    seconds = (times.astype("datetime64[ns]") - np.datetime64("2000-01-01T12:00:00", "ns")) / np.timedelta64(1, "s")
+    return J2000 + seconds / 86400.0
+
+
+# -------------------------
+# ROTATIONS (passive, as in the IAU conventions)
+# -------------------------
+def _r1(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(c), np.zeros_like(c)
+    return np.stack([np.stack([one, zero, zero], -1),
+                     np.stack([zero, c, s], -1),
+                     np.stack([zero, -s, c], -1)], -2)
+
+
+def _r2(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(c), np.zeros_like(c)
+    return np.stack([np.stack([c, zero, -s], -1),
+                     np.stack([zero, one, zero], -1),
+                     np.stack([s, zero, c], -1)], -2)
+
+
+def _r3(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(c), np.zeros_like(c)
+    return np.stack([np.stack([c, s, zero], -1),
+                     np.stack([-s, c, zero], -1),
+                     np.stack([zero, zero, one], -1)], -2)
+
+
+# -------------------------
+# EARTH ORIENTATION
+# -------------------------
+def mean_obliquity(T):
+    """Mean obliquity of the ecliptic (radians), T in Julian centuries of TT from J2000."""
+    return (84381.448 - 46.8150 * T - 0.00059 * T ** 2 + 0.001813 * T ** 3) * ARCSEC
+
+
+def precession_matrix(T):
+    """IAU 1976 precession from the J2000 mean equator to the mean equator of date."""
+    zeta = (2306.2181 * T + 0.30188 * T ** 2 + 0.017998 * T ** 3) * ARCSEC
+    z = (2306.2181 * T + 1.09468 * T ** 2 + 0.018203 * T ** 3) * ARCSEC
+    theta = (2004.3109 * T - 0.42665 * T ** 2 - 0.041833 * T ** 3) * ARCSEC
+    return _r3(-z) @ _r2(theta) @ _r3(-zeta)
+
+
+def nutation(T):
+    """Nutation in longitude and obliquity (radians) from the four largest terms, ~0.5 arcsec."""
+    omega = np.radians(125.04452 - 1934.136261 * T)      # Moon's ascending node
+    L_sun = np.radians(280.4665 + 36000.7698 * T)
+    L_moon = np.radians(218.3165 + 481267.8813 * T)
+    d_psi = (-17.20 * np.sin(omega) - 1.32 * np.sin(2 * L_sun)
+             - 0.23 * np.sin(2 * L_moon) + 0.21 * np.sin(2 * omega)) * ARCSEC
+    d_eps = (9.20 * np.cos(omega) + 0.57 * np.cos(2 * L_sun)
+             + 0.10 * np.cos(2 * L_moon) - 0.09 * np.cos(2 * omega)) * ARCSEC
+    return d_psi, d_eps
+
+
+def gmst(jd_ut1):
+    """Greenwich mean sidereal time in radians."""
+    d = jd_ut1 - J2000
+    T = d / 36525.0
+    degrees = 280.46061837 + 360.98564736629 * d + 0.000387933 * T ** 2 - T ** 3 / 38710000.0
+    return np.radians(degrees % 360.0)
+
+
+def earth_velocity(T):
+    """
+    Earth's orbital velocity / c in J2000 equatorial coordinates (circular
+    orbit), from the Sun's apparent longitude.
+    """
+    M = np.radians(357.52911 + 35999.05029 * T)
+    longitude = 280.46646 + 36000.76983 * T + 1.914602 * np.sin(M) + 0.019993 * np.sin(2 * M)
+    longitude = np.radians(longitude - 1.396971 * T)       # referred to the J2000 equinox
+    eps = mean_obliquity(0.0)
+    vx = ABERRATION_CONSTANT * np.sin(longitude)
+    vy = -ABERRATION_CONSTANT * np.cos(longitude)
+    return np.stack([vx, vy * np.cos(eps), vy * np.sin(eps)], axis=-1)
+
+
+class AltAzFrame:
+    """
+    Horizon frames of one observer over a grid of times.
+
+    latitude, longitude are geodetic degrees (east positive); times are
+    datetime64 values or Julian dates (UTC). The per-time matrices, sidereal
+    times and aberration vectors are computed once, here.
+    """
+
+    def __init__(self, latitude, longitude, times, dut1=0.0, tt_minus_utc=TT_MINUS_UTC):
+        self.latitude, self.longitude = float(latitude), float(longitude)
+        self.jd = np.atleast_1d(julian_date(times))
+        T = (self.jd + tt_minus_utc / 86400.0 - J2000) / 36525.0
+        eps = mean_obliquity(T)
+        d_psi, d_eps = nutation(T)
+
+        self.gast = (gmst(self.jd + dut1 / 86400.0) + d_psi * np.cos(eps + d_eps)) % (2 * np.pi)
+        self.lst = (self.gast + np.radians(self.longitude)) % (2 * np.pi)
+
+        # J2000 -> true equator of date -> hour angle frame -> horizon (north, east, up)
+        to_date = _r1(-eps - d_eps) @ _r3(-d_psi) @ _r1(eps) @ precession_matrix(T)
+        flip = np.diag([-1.0, 1.0, 1.0])
+        tilt = flip @ _r2(np.pi / 2 - np.radians(self.latitude))
+        self.matrices = tilt @ _r3(self.lst) @ to_date          # (n_times, 3, 3)
+        self.velocity = earth_velocity(T)                        # (n_times, 3)
+
+        # Aberration to first order: u' = u + v - u (u . v), so for each row m
+        # of a matrix, m . u' = (m . u)(1 - u . v) + m . v. Rows and velocity
+        # are stored transposed so products come out object-major, (n, n_times)
+        self._rows = [np.ascontiguousarray(self.matrices[:, i, :].T) for i in range(3)]
+        self._velocity_t = np.ascontiguousarray(self.velocity.T)
+        self._row_dot_velocity = np.einsum("tij,tj->it", self.matrices, self.velocity)
+
+    def __len__(self):
+        return len(self.jd)
+
+    def _components(self, units, which):
+        """Components (0 north, 1 east, 2 up) of the apparent directions, each (n_objects, n_times)."""
+        scale = units @ self._velocity_t
+        np.subtract(1.0, scale, out=scale)
+        result = []
+        for i in which:
+            component = units @ self._rows[i]
+            component *= scale
+            component += self._row_dot_velocity[i]
+            result.append(component)
+        return result
+
+    def sin_altitude(self, ra_deg, dec_deg):
+        """sin(altitude), shape (n_times, n_objects), without any trigonometry per pair."""
+        (up,) = self._components(radec_to_unit(ra_deg, dec_deg), (2,))
+        return up.T
+
+    def altaz(self, ra_deg, dec_deg):
+        """Altitude and azimuth (degrees, azimuth from north through east), each (n_times, n_objects)."""
+        north, east, up = self._components(radec_to_unit(ra_deg, dec_deg), (0, 1, 2))
+        altitude = np.degrees(np.arctan2(up, np.hypot(north, east)))
+        azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+        return altitude.T, azimuth.T
+
+    def visibility(self, ra_deg, dec_deg, min_altitude=30.0, chunk=256):
+        """
+        Per-object summary over the time grid: the number of time steps above
+        min_altitude, the maximum altitude and the time index of that maximum.
+        Objects go through in small chunks, so the (chunk, n_times) working
+        arrays stay in cache and memory does not grow with n_objects.
+        """
+        units = radec_to_unit(ra_deg, dec_deg)
+        n = len(units)
+        steps_up = np.empty(n, dtype=np.int64)
+        best = np.empty(n, dtype=np.int64)
+        max_sin = np.empty(n)
+        threshold = np.sin(np.radians(min_altitude))
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            (up,) = self._components(units[start:stop], (2,))
+            steps_up[start:stop] = np.count_nonzero(up > threshold, axis=1)
+            best[start:stop] = up.argmax(axis=1)
+            max_sin[start:stop] = np.take_along_axis(up, best[start:stop, None], axis=1)[:, 0]
+        return {"steps_up": steps_up, "max_altitude": np.degrees(np.arcsin(np.clip(max_sin, -1.0, 1.0))),
+                "best_time": best}
+
+
+_FRAMES = OrderedDict()
+
+
+def get_frame(latitude, longitude, times, dut1=0.0, maxsize=16):
+    """AltAzFrame for this observer and time grid, reused across calls with the same grid."""
+    jd = np.atleast_1d(julian_date(times))
+    key = (float(latitude), float(longitude), float(dut1), jd.tobytes())
+    frame = _FRAMES.get(key)
+    if frame is None:
+        frame = _FRAMES[key] = AltAzFrame(latitude, longitude, jd, dut1)
+        if len(_FRAMES) > maxsize:
+            _FRAMES.popitem(last=False)
+    else:
+        _FRAMES.move_to_end(key)
+    return frame
+
+
+def radec_to_altaz(ra_deg, dec_deg, times, latitude, longitude, dut1=0.0):
+    """Altitude and azimuth in degrees, each of shape (n_times, n_objects)."""
+    return get_frame(latitude, longitude, times, dut1).altaz(ra_deg, dec_deg)
+
+
+def night_grid(date, n_times=1000, start_hour=18.0, hours=12.0):
+    """n_times datetime64 values over the night starting at start_hour UTC on date."""
+    start = np.datetime64(date, "ns") + np.timedelta64(int(start_hour * 3600e9), "ns")
+    return start + (np.arange(n_times) * (hours * 3600e9 / n_times)).astype("timedelta64[ns]")
+
+
+# -------------------------
+# CHECK AGAINST ASTROPY
+# -------------------------
+def check_against_astropy(n_objects=2000, n_times=50, seed=0, tolerance_arcsec=3.0,
+                          latitude=31.96, longitude=-111.6, date="2025-01-15"):
+    """
+    Compare with astropy's SkyCoord -> AltAz (no refraction, same UT1 - UTC)
+    for random objects above the horizon, and raise ValueError if any
+    direction differs by more than tolerance_arcsec. Returns the errors in
+    arcseconds (max, rms).
+    """
+    import astropy.units as u
+    from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+    from astropy.time import Time
+    from astropy.utils import iers
+
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0.0, 360.0, n_objects)
+    dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, n_objects)))
+    times = night_grid(date, n_times)
+
+    with iers.conf.set_temp("auto_download", False):  # use the bundled IERS tables, offline
+        t = Time(times, scale="utc")
+        dut1 = float(np.mean(t.delta_ut1_utc))
+        location = EarthLocation(lon=longitude * u.deg, lat=latitude * u.deg, height=0 * u.m)
+        frame = AltAz(obstime=t[:, None], location=location, pressure=0)
+        reference = SkyCoord(ra=ra[None, :] * u.deg, dec=dec[None, :] * u.deg).transform_to(frame)
+
+    altitude, azimuth = AltAzFrame(latitude, longitude, times, dut1=dut1).altaz(ra, dec)
+    ours = radec_to_unit(azimuth, altitude)
+    theirs = radec_to_unit(reference.az.deg, reference.alt.deg)
+    separation = 2.0 * np.arcsin(np.clip(np.linalg.norm(ours - theirs, axis=-1) / 2.0, 0.0, 1.0))
+    errors = separation[reference.alt.deg > 0.0] / ARCSEC
+    worst, rms = float(errors.max()), float(np.sqrt(np.mean(errors ** 2)))
+    if not worst < tolerance_arcsec:
+        raise ValueError(f"max error {worst:.2f} arcsec exceeds {tolerance_arcsec} arcsec")
+    return worst, rms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the RA/Dec -> Alt/Az fast path, or check it against astropy.")
+    parser.add_argument("--objects", type=int, default=1_000_000)
+    parser.add_argument("--times", type=int, default=1000)
+    parser.add_argument("--latitude", type=float, default=31.96)
+    parser.add_argument("--longitude", type=float, default=-111.6)
+    parser.add_argument("--date", default="2025-01-15")
+    parser.add_argument("--min-altitude", type=float, default=30.0)
+    parser.add_argument("--check", action="store_true", help="compare with astropy instead of timing")
+    args = parser.parse_args()
+
+    if args.check:
+        worst, rms = check_against_astropy(latitude=args.latitude, longitude=args.longitude, date=args.date)
+        print(f"Agrees with astropy: max {worst:.3f} arcsec, rms {rms:.3f} arcsec")
+        return
+
+    rng = np.random.default_rng(0)
+    ra = rng.uniform(0.0, 360.0, args.objects)
+    dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, args.objects)))
+    times = night_grid(args.date, args.times)
+
+    start = time.perf_counter()
+    frame = get_frame(args.latitude, args.longitude, times)
+    setup = time.perf_counter() - start
+    start = time.perf_counter()
+    summary = frame.visibility(ra, dec, args.min_altitude)
+    elapsed = time.perf_counter() - start
+    hours = summary["steps_up"] * 12.0 / args.times
+    print(f"Frame for {args.times} times in {setup * 1e3:.1f} ms; visibility of {args.objects:,} objects "
+          f"x {args.times} times in {elapsed:.1f} s ({args.objects * args.times / elapsed / 1e6:.0f} M pairs/s)")
+    print(f"{np.count_nonzero(hours > 0):,} objects rise above {args.min_altitude} deg; "
+          f"mean {hours[hours > 0].mean():.2f} h up")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,69 @@
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 import time
-import random
+from star_raster import create_star_grid
+from grid_view import run_star_grids
+from differential_photometry import differential_status
+from correlated_noise import BrightnessNoise
 
-def create_star_grid(dim=10, fill_value=0.0, transit_value=1.0):
-    """Create a grid representing a star with a roughly circular illuminated region."""
-    grid = np.ones((dim, dim)) * fill_value  # Background is black
-    
-    # Define the approximate circular region to dim/2 radius
-    center = dim // 2
-    radius = dim // 3  # Adjust to cover ~60% of squares
-    
-    for i in range(dim):
-        for j in range(dim):
-            if (i - center)**2 + (j - center)**2 <= radius**2:
-                grid[i, j] = transit_value  # Bright star region
-    
-    return grid
+TITLES = ["Comparison Star (Left)", "Target Star (Right)"]
+SUPTITLE = "Simulating Atmospheric Brightness Variations in Comparison and Target Stars"
+
+def next_brightnesses(noise):
+    """Correlated brightness between 50% and 100%, applied identically to both stars."""
+    brightness = float(noise.next()[0])
+    return brightness, brightness
+
+def plot_grids(fast=False, dim=10, interval=None, tau=5.0, seed=None):
+    """
+    Animate the comparison and target stars with random brightness.
+
+    fast=True keeps the image artists and grid and only updates the pixel
+    data each tick, reporting the achieved frame rate and the differential
+    (target / comparison) photometry; the default redraws
+    both axes from scratch every half second.
+
+    Brightness follows correlated noise (one transparency stream shared by
+    both stars) with correlation time tau ticks; seed makes it reproducible.
+    The noise source is built per call, so every run (and every forked
+    launcher child) gets its own sequence.
+    """
+    noise = BrightnessNoise(n_streams=1, low=0.5, high=1.0, tau=tau, seed=seed)
+    if fast:
+        return run_star_grids(TITLES, SUPTITLE, lambda: next_brightnesses(noise), dim=dim,
+                              interval=1 / 60 if interval is None else interval,
+                              status=differential_status())
+    if interval is None:
+        interval = 0.5
 
-def plot_grids():
     fig, axes = plt.subplots(1, 2, figsize=(10, 5))
     plt.ion()  # Turn on interactive mode
+
+    # Grids are allocated once and refilled in place every tick
+    grid_white = create_star_grid(dim)
+    grid_95_white = create_star_grid(dim)
     
     try:
         while plt.fignum_exists(fig.number):  # Check if figure is still open
-            # Random brightness between 50% and 100%, applied identically to both stars
-            brightness = random.uniform(0.5, 1.0)
+            # Correlated brightness between 50% and 100%, applied identically to both stars
+            brightness, _ = next_brightnesses(noise)
             
-            grid_white = create_star_grid(transit_value=brightness)  # Left star brightness
-            grid_95_white = create_star_grid(transit_value=brightness)  # Right star brightness
+            create_star_grid(dim, transit_value=brightness, out=grid_white)  # Left star brightness
+            create_star_grid(dim, transit_value=brightness, out=grid_95_white)  # Right star brightness
             
             for ax, grid, title in zip(axes, [grid_white, grid_95_white],
-                                       ["Comparison Star (Left)", "Target Star (Right)"]):
+                                       TITLES):
                 ax.clear()
                 ax.imshow(grid, cmap='gray', vmin=0, vmax=1)
-                ax.set_xticks(np.arange(-0.5, 10, 1), minor=True)
-                ax.set_yticks(np.arange(-0.5, 10, 1), minor=True)
+                ax.set_xticks(np.arange(-0.5, dim, 1), minor=True)
+                ax.set_yticks(np.arange(-0.5, dim, 1), minor=True)
                 ax.grid(which="minor", color='gray', linestyle='-', linewidth=1)
                 ax.tick_params(which="both", bottom=False, left=False, labelbottom=False, labelleft=False)
                 ax.set_title(title)
             
-            plt.suptitle("Simulating Atmospheric Brightness Variations in Comparison and Target Stars")
-            plt.pause(0.5)  # Pause for half a second before updating
+            plt.suptitle(SUPTITLE)
+            plt.pause(interval)  # Pause (half a second by default) before updating
     except KeyboardInterrupt:
         pass  # Allow clean exit when user interrupts execution
     finally:
@@ -49,4 +71,11 @@ def plot_grids():
         plt.close(fig)
 
 if __name__ == "__main__":
-    plot_grids()
+    parser = argparse.ArgumentParser(description=SUPTITLE)
+    parser.add_argument("--fast", action="store_true", help="persistent artists, reports fps")
+    parser.add_argument("--dim", type=int, default=10, help="grid size in pixels")
+    parser.add_argument("--interval", type=float, default=None, help="seconds between ticks")
+    parser.add_argument("--tau", type=float, default=5.0, help="noise correlation time in ticks")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    plot_grids(fast=args.fast, dim=args.dim, interval=args.interval, tau=args.tau, seed=args.seed)
@@ -0,0 +1,214 @@
+"""
+Headless benchmark suite for the simulation and rendering hot paths.
+
+Each benchmark times one call of a hot path (best of several repeats, so
+noise from other processes only ever makes a result slower):
+
+    star_grid[dim]          star_raster.create_star_grid refilling a grid in place
+    transit_flux[n]         light_curve.transit_flux over an n-sample series
+    limb_darkened_flux[n]   limb_darkening.limb_darkened_flux (table path)
+    transform_points[n]     dipper-perspective.transform_points on n points
+    update[demo]            one update() of an animation scene
+    frame[demo]             one update() plus a full Agg canvas draw
+
+Results are written as JSON together with the machine and library versions,
+and a run can be compared against an earlier one; anything slower by more
+than the threshold is reported and the command exits with status 1.
+
+Example:
+    python benchmarks.py --output baseline.json
+    python benchmarks.py --compare baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from demos import SCENES, build_scene, load_script
+
+
+def best_time(func, repeat=5, min_seconds=0.05):
+    """
+    Seconds per call of func(): calls are batched until a batch takes at
+    least min_seconds, and the fastest of `repeat` batches is kept.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_seconds:
+            break
+        number *= 2
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+# -------------------------
+# BENCHMARK CASES
+# -------------------------
+# Each case builder returns {name: setup}, where setup() allocates the inputs
+# and returns the zero-argument callable to time, or (callable, teardown) when
+# something has to be released after timing. Only the cases selected by name
+# are set up. quick=True uses smaller sizes so the whole suite runs in a
+# few seconds.
+def star_grid_cases(quick=False):
+    def setup(dim):
+        from star_raster import create_star_grid
+        out = np.empty((dim, dim))
+        return lambda: create_star_grid(dim, out=out)
+
+    return {f"star_grid[{dim}]": lambda dim=dim: setup(dim)
+            for dim in ((10, 100, 1000) if quick else (10, 100, 1000, 4000))}
+
+
+def flux_cases(quick=False):
+    def transit(n):
+        from light_curve import transit_flux
+        x = np.linspace(-2.0, 2.0, n)
+        return lambda: transit_flux(x, 0.1, impact=0.3)
+
+    def limb_darkened(n):
+        from limb_darkening import coefficient_table, limb_darkened_flux
+        coefficient_table(0.4, 0.26)  # build the tables outside the timing
+        separation = np.abs(np.linspace(-2.0, 2.0, n))
+        return lambda: limb_darkened_flux(separation, 0.1, 0.4, 0.26)
+
+    cases = {}
+    for n in (10_000, 1_000_000) if quick else (10_000, 1_000_000, 10_000_000):
+        cases[f"transit_flux[{n}]"] = lambda n=n: transit(n)
+        cases[f"limb_darkened_flux[{n}]"] = lambda n=n: limb_darkened(n)
+    return cases
+
+
+def transform_points_cases(quick=False):
+    def setup(n):
+        transform_points = load_script("dipper-perspective.py").transform_points
+        points = np.random.default_rng(0).random((n, 2))
+        return lambda: transform_points(points, 1.5, 30.0, (2.0, -1.0))
+
+    return {f"transform_points[{n}]": lambda n=n: setup(n)
+            for n in ((1_000, 1_000_000) if quick else (1_000, 1_000_000, 10_000_000))}
+
+
+def scene_cases(quick=False):
+    """Per-frame cost of every animated demo, with and without drawing."""
+    def setup(name, draw):
+        from frame_export import use_agg
+        plt = use_agg()
+        scene = build_scene(name)
+        counter = {"frame": 0}
+
+        def update():
+            # Restart the loop the way FuncAnimation does when it repeats
+            frame = counter["frame"] % scene.frames
+            if frame == 0 and scene.init is not None:
+                scene.init()
+            scene.update(frame)
+            counter["frame"] += 1
+
+        def frame():
+            update()
+            scene.fig.canvas.draw()
+
+        # Close the figure after timing so later cases don't run with it open
+        return (frame if draw else update), lambda: plt.close(scene.fig)
+
+    cases = {}
+    for name in SCENES:
+        cases[f"update[{name}]"] = lambda name=name: setup(name, False)
+        cases[f"frame[{name}]"] = lambda name=name: setup(name, True)
+    return cases
+
+
+CASE_BUILDERS = [star_grid_cases, flux_cases, transform_points_cases, scene_cases]
+
+
+def machine_info():
+    import matplotlib
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(pattern=None, quick=False, repeat=5, verbose=True):
+    """
+    Run every benchmark whose name contains `pattern` (all by default).
+    Returns {"machine": ..., "created": ..., "results": {name: seconds per call}}.
+    """
+    results = {}
+    for builder in CASE_BUILDERS:
+        for name, setup in builder(quick).items():
+            if pattern and pattern not in name:
+                continue
+            func = setup()
+            func, teardown = func if isinstance(func, tuple) else (func, None)
+            try:
+                results[name] = best_time(func, repeat)
+            finally:
+                if teardown is not None:
+                    teardown()
+            if verbose:
+                print(f"{name:32s} {format_seconds(results[name])}")
+    return {"machine": machine_info(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+            "results": results}
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Benchmarks present in both runs that got slower by more than `threshold`
+    (0.2 = 20%). Returns a list of (name, baseline seconds, current seconds).
+    """
+    before, after = baseline["results"], current["results"]
+    return [(name, before[name], after[name]) for name in after
+            if name in before and after[name] > before[name] * (1.0 + threshold)]
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the BAS simulation and rendering hot paths.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="flag benchmarks slower than the baseline by more than this fraction")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="smaller problem sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.filter, args.quick, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Wrote {len(current['results'])} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = compare(baseline, current, args.threshold)
+        for name, before, after in slower:
+            print(f"SLOWER  {name:32s} {format_seconds(before)} -> {format_seconds(after)} "
+                  f"(+{after / before - 1.0:.0%})")
+        if slower:
+            sys.exit(1)
+        print(f"No benchmark slower than {args.compare} by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Memory-mapped binary catalog format.
+
+A catalog is two files:
+
+    <path>        64-byte header followed by fixed-width records
+                  (ra f8, dec f8, id i8, name_offset u8, name_length u4, pad u4)
+    <path>.names  all names as UTF-8, back to back; each record points into it
+
+Opening a catalog only maps the files (np.memmap), so even 10^7 rows open
+instantly and pages are read from disk only when rows are touched. New rows
+are appended in place: records and names go on the end of their files and the
+row count in the header is updated last, so a crash mid-append leaves the
+previous catalog intact.
+
+Example:
+    python catalog_store.py perspective/galaxies.csv galaxies.cat
+"""
+import argparse
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"BASCAT\x00\x01"
+VERSION = 1
+HEADER_SIZE = 64
+# magic, version, record size, row count
+HEADER_FORMAT = "<8sIIQ"
+
+RECORD_DTYPE = np.dtype([
+    ("ra", "<f8"),            # degrees
+    ("dec", "<f8"),           # degrees
+    ("id", "<i8"),
+    ("name_offset", "<u8"),   # byte offset into the .names blob
+    ("name_length", "<u4"),   # bytes
+    ("pad", "<u4"),
+])
+
+
+def _names_path(path):
+    return path + ".names"
+
+
+def _read_header(f):
+    f.seek(0)
+    magic, version, record_size, n_rows = struct.unpack(
+        HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT)))
+    if magic != MAGIC:
+        raise ValueError("not a BAS binary catalog")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"unsupported catalog version {version} (record size {record_size})")
+    return n_rows
+
+
+def _write_header(f, n_rows):
+    f.seek(0)
+    f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, RECORD_DTYPE.itemsize, n_rows)
+            .ljust(HEADER_SIZE, b"\x00"))
+
+
+def _encode_records(ra, dec, names, ids, first_offset):
+    encoded = [str(name).encode("utf-8") for name in names]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.uint64, count=len(encoded))
+    records = np.zeros(len(encoded), dtype=RECORD_DTYPE)
+    records["ra"] = ra
+    records["dec"] = dec
+    records["id"] = ids
+    records["name_length"] = lengths
+    records["name_offset"] = first_offset + np.cumsum(lengths) - lengths
+    return records, b"".join(encoded)
+
+
+def write_catalog(path, ra, dec, names, ids=None):
+    """Create (or overwrite) a binary catalog from RA/Dec in degrees and names."""
+    ids = np.arange(len(ra)) if ids is None else ids
+    records, blob = _encode_records(ra, dec, names, ids, 0)
+    with open(_names_path(path), "wb") as f:
+        f.write(blob)
+    with open(path, "wb") as f:
+        _write_header(f, 0)
+        f.write(records.tobytes())
+        _write_header(f, len(records))
+    return len(records)
+
+
+def append_rows(path, ra, dec, names, ids=None):
+    """
+    Append rows to an existing catalog without rewriting it.
+    ids default to continuing the existing row numbering.
+    """
+    with open(path, "r+b") as f, open(_names_path(path), "ab") as names_file:
+        n_rows = _read_header(f)
+        ids = np.arange(n_rows, n_rows + len(ra)) if ids is None else ids
+        records, blob = _encode_records(ra, dec, names, ids, names_file.tell())
+        names_file.write(blob)
+        names_file.flush()
+
+        f.seek(HEADER_SIZE + n_rows * RECORD_DTYPE.itemsize)
+        f.write(records.tobytes())
+        f.truncate()  # drop anything left over from an interrupted append
+        f.flush()
+        _write_header(f, n_rows + len(records))  # commit
+    return n_rows + len(records)
+
+
+def csv_to_catalog(csv_path, path):
+    """Convert a Name,RA(2000),DEC(2000) CSV such as perspective/galaxies.csv."""
+    from galaxy_catalog import load_galaxies
+    catalog = load_galaxies(csv_path)
+    return write_catalog(path, catalog.ra, catalog.dec, catalog.names)
+
+
+class BinaryCatalog:
+    """
+    Read-only, memory-mapped view of a binary catalog.
+    ra, dec and ids are views into the mapped file; nothing is read until used.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            n_rows = _read_header(f)
+        self.records = (np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n_rows,))
+                        if n_rows else np.zeros(0, dtype=RECORD_DTYPE))
+        names_size = os.path.getsize(_names_path(path))
+        self._names = (np.memmap(_names_path(path), dtype=np.uint8, mode="r")
+                       if names_size else np.zeros(0, dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def ra(self):
+        return self.records["ra"]
+
+    @property
+    def dec(self):
+        return self.records["dec"]
+
+    @property
+    def ids(self):
+        return self.records["id"]
+
+    def name(self, i):
+        record = self.records[i]
+        start = int(record["name_offset"])
+        return bytes(self._names[start:start + int(record["name_length"])]).decode("utf-8")
+
+    def names(self, rows=slice(None)):
+        """Decode the names of a slice or array of rows."""
+        return [self.name(i) for i in np.arange(len(self))[rows]]
+
+    def to_galaxy_catalog(self):
+        """Load everything into a galaxy_catalog.GalaxyCatalog (for cone searches)."""
+        from galaxy_catalog import GalaxyCatalog
+        return GalaxyCatalog(self.names(), np.array(self.ra), np.array(self.dec))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a galaxy CSV into a memory-mapped binary catalog.")
+    parser.add_argument("csv")
+    parser.add_argument("output")
+    args = parser.parse_args()
+    n = csv_to_catalog(args.csv, args.output)
+    print(f"Wrote {n} rows to {args.output} (+ {_names_path(args.output)})")
+
+
+if __name__ == "__main__":
+    main()
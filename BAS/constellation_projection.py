@@ -0,0 +1,113 @@
+"""
+Batched 3-D perspective projection of constellations.
+
+Stars are placed in 3-D from RA, Dec and distance (light-years, with the Sun
+at the origin, +x toward RA 0h and +z toward the north celestial pole). Each
+observer looks at a target point, and every star is projected onto that
+observer's tangent plane. All observers are handled in one matrix operation,
+giving an (observers, stars, 2) array, so thousands of viewpoints along a
+flight path cost a single einsum.
+"""
+import numpy as np
+
+# name, RA (hours), Dec (degrees), distance (light-years); J2000, rounded.
+# Listed in the order the stick figure is drawn, repeating a star to close the bowl.
+BIG_DIPPER = [
+    ("Alkaid", 13.7923, 49.3133, 103.9),
+    ("Mizar", 13.3987, 54.9253, 82.9),
+    ("Alioth", 12.9005, 55.9597, 82.6),
+    ("Megrez", 12.2571, 57.0325, 80.5),
+    ("Phecda", 11.8972, 53.6947, 83.2),
+    ("Merak", 11.0307, 56.3825, 79.7),
+    ("Dubhe", 11.0621, 61.7508, 123.0),
+    ("Megrez", 12.2571, 57.0325, 80.5),
+]
+
+LITTLE_DIPPER = [
+    ("Polaris", 2.5303, 89.2642, 433.0),
+    ("Yildun", 17.5369, 86.5864, 172.0),
+    ("Epsilon UMi", 16.7662, 82.0372, 347.0),
+    ("Zeta UMi", 15.7343, 77.7945, 370.0),
+    ("Eta UMi", 16.2918, 75.7553, 97.0),
+    ("Pherkad", 15.3455, 71.8339, 487.0),
+    ("Kochab", 14.8451, 74.1555, 131.0),
+    ("Zeta UMi", 15.7343, 77.7945, 370.0),
+]
+
+
+def star_positions(ra_hours, dec_deg, distance):
+    """Cartesian positions (n, 3) in the units of `distance`."""
+    ra = np.radians(15.0 * np.asarray(ra_hours, dtype=float))
+    dec = np.radians(np.asarray(dec_deg, dtype=float))
+    distance = np.asarray(distance, dtype=float)
+    return np.stack([distance * np.cos(dec) * np.cos(ra),
+                     distance * np.cos(dec) * np.sin(ra),
+                     distance * np.sin(dec)], axis=-1)
+
+
+def constellation_positions(stars):
+    """Cartesian positions (n, 3) for a list of (name, RA h, Dec deg, distance) tuples."""
+    _, ra, dec, distance = zip(*stars)
+    return star_positions(ra, dec, distance)
+
+
+def _normalize(v):
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def camera_basis(observers, targets, up=(0.0, 0.0, 1.0)):
+    """
+    (observers, 3, 3) rotation matrices whose rows are each camera's right,
+    up and forward axes. Forward points from the observer to its target;
+    right = forward x up, which puts east on the left as on a sky chart.
+    """
+    forward = _normalize(np.asarray(targets, dtype=float) - np.asarray(observers, dtype=float))
+    up = np.broadcast_to(np.asarray(up, dtype=float), forward.shape)
+    # Where forward is parallel to up, fall back to another reference direction
+    parallel = np.abs((forward * up).sum(axis=-1)) > 1.0 - 1e-9
+    up = np.where(parallel[..., None], np.array([1.0, 0.0, 0.0]), up)
+    right = _normalize(np.cross(forward, up))
+    cam_up = np.cross(right, forward)
+    return np.stack([right, cam_up, forward], axis=-2)
+
+
+def project(stars_xyz, observers, targets=None, up=(0.0, 0.0, 1.0)):
+    """
+    Project stars (n_stars, 3) for a batch of observers (n_observers, 3).
+
+    targets defaults to the stars' centroid for every observer. Returns an
+    (n_observers, n_stars, 2) array of gnomonic tangent-plane coordinates
+    (tan of the angle from the line of sight); stars behind an observer are NaN.
+    """
+    stars_xyz = np.asarray(stars_xyz, dtype=float)
+    observers = np.atleast_2d(np.asarray(observers, dtype=float))
+    if targets is None:
+        targets = stars_xyz.mean(axis=0)
+    basis = camera_basis(observers, np.broadcast_to(targets, observers.shape), up)
+
+    # Every star relative to every observer, rotated into camera axes at once
+    camera = np.einsum("osk,ojk->osj", stars_xyz[None, :, :] - observers[:, None, :], basis)
+    depth = camera[..., 2:3]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(depth > 0, camera[..., :2] / depth, np.nan)
+
+
+def flight_path(start, end, n):
+    """n observer positions evenly spaced on the straight line from start to end."""
+    t = np.linspace(0.0, 1.0, n)[:, None]
+    return (1.0 - t) * np.asarray(start, dtype=float) + t * np.asarray(end, dtype=float)
+
+
+def fit_to_box(points, xlim, ylim, margin=0.1):
+    """
+    Scale and shift projected points (..., 2) into the box xlim x ylim,
+    keeping their aspect ratio. NaNs (stars behind the observer) are ignored.
+    """
+    points = np.asarray(points, dtype=float)
+    lo = np.nanmin(points.reshape(-1, 2), axis=0)
+    hi = np.nanmax(points.reshape(-1, 2), axis=0)
+    box_lo = np.array([xlim[0], ylim[0]], dtype=float)
+    box_size = np.array([xlim[1] - xlim[0], ylim[1] - ylim[0]], dtype=float)
+    scale = np.min((1.0 - 2.0 * margin) * box_size / np.maximum(hi - lo, 1e-12))
+    center = box_lo + box_size / 2.0
+    return (points - (lo + hi) / 2.0) * scale + center
@@ -0,0 +1,142 @@
+"""
+Correlated noise for atmospheric and stellar variability.
+
+Two generators, both producing (n_streams, n) batches of independent streams
+from one seeded np.random.Generator:
+
+    power_law_noise  1/f^alpha ("red", "pink", ...) noise by shaping the
+                     spectrum of white noise with one real FFT per batch
+    ou_noise         Ornstein-Uhlenbeck / AR(1) noise, the Gaussian process
+                     with an exponential kernel exp(-|dt| / tau). The
+                     recurrence x[k] = phi x[k-1] + e[k] is evaluated as a
+                     block scan: the series is cut into blocks just long
+                     enough for phi^L to vanish, every block is scanned at
+                     once with a cumulative sum, and each block then only needs
+                     the carry from the end of the previous one. O(n), no
+                     Python loop over samples.
+
+BrightnessNoise wraps ou_noise as an endless per-tick source for the
+animations, continuing the process state from one chunk to the next.
+"""
+import numpy as np
+
+
+def power_law_noise(n, n_streams=1, alpha=1.0, seed=None, dtype=np.float64):
+    """
+    Zero-mean, unit-variance noise with power spectrum ~ 1 / f^alpha
+    (alpha = 0 white, 1 pink / flicker, 2 red / random walk).
+    Returns an (n_streams, n) array.
+    """
+    rng = np.random.default_rng(seed)
+    n_freq = n // 2 + 1
+    f = np.arange(n_freq, dtype=float)
+    scale = np.zeros(n_freq)
+    scale[1:] = f[1:] ** (-alpha / 2.0)
+
+    spectrum = rng.standard_normal((n_streams, n_freq)) + 1j * rng.standard_normal((n_streams, n_freq))
+    spectrum *= scale
+    noise = np.fft.irfft(spectrum, n=n, axis=-1)
+
+    # Expected variance of the inverse transform, so every stream has unit
+    # variance in expectation (not normalized sample by sample). Each bin with
+    # a conjugate partner contributes 4 scale^2 / n^2; for even n the last bin
+    # is the Nyquist bin, which is its own partner and keeps only its real
+    # part (scale^2 / n^2).
+    last = scale[-1] ** 2 if n % 2 == 0 else 4.0 * scale[-1] ** 2
+    variance = (4.0 * np.sum(scale[1:-1] ** 2) + last) / n ** 2
+    noise /= np.sqrt(variance)
+    return noise.astype(dtype, copy=False)
+
+
+def ou_noise(n, tau, sigma=1.0, n_streams=1, seed=None, x0=None, dtype=np.float64):
+    """
+    Stationary Ornstein-Uhlenbeck noise sampled once per time step.
+
+    tau   : correlation time in samples (autocorrelation exp(-lag / tau))
+    sigma : standard deviation of the process
+    x0    : state before the first sample, shape (n_streams,); drawn from
+            the stationary distribution when None. Pass the last sample of
+            a previous batch to continue it.
+    Returns an (n_streams, n) array.
+    """
+    rng = np.random.default_rng(seed)
+    phi = np.exp(-1.0 / tau)
+    log_phi = -1.0 / tau
+    if x0 is None:
+        x0 = rng.standard_normal(n_streams) * sigma
+    x0 = np.broadcast_to(np.asarray(x0, dtype=float), (n_streams,))
+
+    # Blocks of L samples with phi^L ~ e^-40: a block's start value no longer
+    # matters by its end, so only the carry from the previous block is needed
+    L = int(min(n, max(1, np.ceil(40.0 / -log_phi))))
+    n_blocks = -(-n // L)
+    e = rng.standard_normal((n_streams, n_blocks * L))
+    e *= sigma * np.sqrt(1.0 - phi ** 2)
+    e = e.reshape(n_streams, n_blocks, L)
+
+    # Scan inside every block at once: x_j = phi^j * cumsum(e_i / phi^i)
+    j = np.arange(L)
+    up = np.exp(-log_phi * j)      # phi^-j, at most e^40
+    down = np.exp(log_phi * j)     # phi^j
+    e *= up
+    x = np.cumsum(e, axis=-1)
+    x *= down
+
+    # Carries: the state before the block decays as phi^(j + 1) into it
+    decay = down * phi
+    x[:, 0] += decay * x0[:, None]
+    if n_blocks > 1:
+        x[:, 1:] += decay * x[:, :-1, -1:]
+    return x.reshape(n_streams, -1)[:, :n].astype(dtype, copy=False)
+
+
+class BrightnessNoise:
+    """
+    Endless correlated brightness for the animations.
+
+    Each call to next() returns one value per stream, following an OU process
+    with correlation time tau ticks, mapped so that its +-2 sigma range spans
+    [low, high] and clipped to it. Samples are generated chunk samples at a
+    time and the process state carries over between chunks.
+    """
+
+    def __init__(self, n_streams=1, low=0.5, high=1.0, tau=10.0, chunk=4096, seed=None):
+        self.n_streams = n_streams
+        self.low, self.high = low, high
+        self.tau = tau
+        self.chunk = chunk
+        self.rng = np.random.default_rng(seed)
+        self._buffer = np.empty((0, n_streams))
+        self._state = None
+        self._position = 0
+
+    def take(self, n):
+        """The next n samples as an (n, n_streams) array (offline use)."""
+        x = ou_noise(n, self.tau, n_streams=self.n_streams, seed=self.rng, x0=self._state)
+        self._state = x[:, -1]
+        center, half = (self.high + self.low) / 2.0, (self.high - self.low) / 2.0
+        return np.clip(center + half * x.T / 2.0, self.low, self.high)
+
+    def next(self):
+        if self._position == len(self._buffer):
+            self._buffer = self.take(self.chunk)
+            self._position = 0
+        value = self._buffer[self._position]
+        self._position += 1
+        return value
+
+
+def main():
+    import time
+    for name, generate in (("ou_noise (tau=50)", lambda: ou_noise(10_000_000, 50.0, seed=0)),
+                           ("ou_noise (tau=1)", lambda: ou_noise(10_000_000, 1.0, seed=0)),
+                           ("ou_noise 100 x 1e5", lambda: ou_noise(100_000, 50.0, n_streams=100, seed=0)),
+                           ("power_law_noise (1/f)", lambda: power_law_noise(2**23, seed=0))):
+        start = time.perf_counter()
+        x = generate()
+        elapsed = time.perf_counter() - start
+        print(f"{name:24s} {x.size / elapsed / 1e6:6.1f} M samples/s  (std {x.std():.3f})")
+
+
+if __name__ == "__main__":
+    main()
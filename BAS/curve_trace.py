@@ -0,0 +1,66 @@
+import numpy as np
+
+
+class LightCurveTrace:
+    """
+    A light-curve Line2D backed by preallocated NumPy buffers.
+
+    Points are written into a fixed buffer instead of growing Python lists, and
+    x / y are views into that buffer, so appending is O(1) and publishing never
+    converts or concatenates. With ring=True the trace keeps only the latest
+    `capacity` points (a sliding window for long runs); the buffer is stored
+    twice over so the window is always one contiguous view. Otherwise appending
+    past `capacity` raises IndexError.
+
+    Matplotlib copies the arrays handed to set_data, so per-frame cost is bounded
+    by `capacity`, not by how long the animation has been running.
+    """
+
+    def __init__(self, line, capacity, ring=False):
+        self.line = line
+        self.capacity = capacity
+        self.ring = ring
+        self._buffer = np.full((2, 2 * capacity if ring else capacity), np.nan)
+        self._start = 0   # first valid column
+        self._count = 0   # number of valid columns
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def x(self):
+        return self._buffer[0, self._start:self._start + self._count]
+
+    @property
+    def y(self):
+        return self._buffer[1, self._start:self._start + self._count]
+
+    def reset(self):
+        """Drop all points (e.g. from an animation's init function)."""
+        self._start = 0
+        self._count = 0
+        return self.publish()
+
+    def append(self, x, y):
+        """Add one (x, y) point."""
+        if not self.ring:
+            if self._count == self.capacity:
+                raise IndexError(f"trace is full ({self.capacity} points)")
+            self._buffer[:, self._count] = (x, y)
+            self._count += 1
+            return
+
+        # Ring: write each point at i and i + capacity, so that the window
+        # [start, start + count) never wraps around the end of the buffer
+        i = (self._start + self._count) % self.capacity
+        self._buffer[:, i] = (x, y)
+        self._buffer[:, i + self.capacity] = (x, y)
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def publish(self):
+        """Hand the current views to the line and return it (for blitting)."""
+        self.line.set_data(self.x, self.y)
+        return self.line
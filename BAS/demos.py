@@ -0,0 +1,69 @@
+import importlib.util
+import os
+import sys
+
+BAS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Animated demos that can be built as a Scene: name -> (script, scene builder)
+SCENES = {
+    "edge-on": ("edge-on.py", "edge_on_transit_scene"),
+    "face-on": ("face-on.py", "exoplanet_transit_scene"),
+    "star-wobble": ("star-wobble.py", "star_planet_wobble_scene"),
+    "multi-system": ("system_view.py", "multi_system_scene"),
+}
+
+# Everything the launcher (python BAS) can start: name -> (script, entry point, description)
+DEMOS = {
+    "edge-on": ("edge-on.py", "edge_on_transit_demo", "Edge-on transit with its light curve"),
+    "face-on": ("face-on.py", "exoplanet_transit_simulation", "Face-on orbit (no transit)"),
+    "star-wobble": ("star-wobble.py", "star_planet_wobble_demo", "Star wobble and radial-velocity colour"),
+    "multi-system": ("system_view.py", "multi_system_demo", "Dozens of wobbling stars and hundreds of planets"),
+    "variability": ("variability-simulation.py", "plot_grids", "Variable star vs. comparison star"),
+    "atmosphere": ("atmospheric-interference-no-transit.py", "plot_grids",
+                   "Atmospheric interference on two stars"),
+    "dipper": ("dipper-perspective.py", "empty_black_squares_with_titles",
+               "Big and Little Dipper from Earth and from space"),
+    "star-plot-black": ("star-plot-black.py", "plot_grids", "Static star grids on black"),
+    "star-plot-white": ("star-plot-white.py", "plot_grids", "Static star grids on white"),
+}
+
+
+def load_script(filename):
+    """
+    Import one of the BAS scripts by file name.
+    The hyphenated names (edge-on.py, ...) cannot be imported with a plain import
+    statement, so load them from their path and register them as e.g. 'edge_on'.
+    """
+    module_name = os.path.splitext(filename)[0].replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    if BAS_DIR not in sys.path:
+        sys.path.insert(0, BAS_DIR)  # so the scripts can import their helper modules
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(BAS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def build_scene(name, **kwargs):
+    """Build the Scene for one of the demos listed in SCENES."""
+    try:
+        filename, builder = SCENES[name]
+    except KeyError:
+        raise ValueError(f"Unknown demo {name!r}; choose from {', '.join(SCENES)}") from None
+    return getattr(load_script(filename), builder)(**kwargs)
+
+
+def run_demo(name, **kwargs):
+    """Import the script behind a DEMOS entry and call its entry point."""
+    try:
+        filename, entry_point, _ = DEMOS[name]
+    except KeyError:
+        raise ValueError(f"Unknown demo {name!r}; choose from {', '.join(DEMOS)}") from None
+    return getattr(load_script(filename), entry_point)(**kwargs)
@@ -0,0 +1,146 @@
+"""
+Streaming differential photometry in constant memory.
+
+The brightness simulations show a target star next to a comparison star.
+Dividing the target flux by the comparison flux cancels whatever both stars
+share (atmospheric transparency, scintillation common to the field) and
+leaves the target's own variability. DifferentialPhotometer consumes
+(target, comparisons) samples one at a time or in batches and emits:
+
+    ratio : target / weighted comparison ensemble
+    mean  : running mean of ratio since the start (Welford / Chan update)
+    var   : running sample variance of ratio since the start
+    rms   : rolling RMS of ratio about its mean over the last `window` samples
+
+Only the running moments and the last `window` ratios are kept, so month-long
+high-cadence streams that do not fit in RAM can be processed.
+"""
+import numpy as np
+
+
+class DifferentialPhotometer:
+    """
+    n_comparison : number of comparison stars in the ensemble
+    weights      : None for equal weights, an array of n_comparison fixed
+                   weights, or "inverse_variance" to weight each comparison
+                   star by 1 / its running variance (normalized by its mean)
+    window       : length of the rolling RMS window in samples
+    """
+
+    def __init__(self, n_comparison=1, weights=None, window=100):
+        self.n_comparison = n_comparison
+        self.window = window
+        self.adaptive = isinstance(weights, str)
+        if self.adaptive and weights != "inverse_variance":
+            raise ValueError("weights must be None, an array, or 'inverse_variance'")
+        self.weights = (np.ones(n_comparison) if weights is None or self.adaptive
+                        else np.asarray(weights, dtype=float))
+
+        # Running moments of the ratio
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # Running moments of each comparison star (for adaptive weights)
+        self._comp_mean = np.zeros(n_comparison)
+        self._comp_m2 = np.zeros(n_comparison)
+        # The last window - 1 ratios, oldest first
+        self._history = np.zeros(0)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def _current_weights(self):
+        if not self.adaptive or self.count < 2:
+            return self.weights
+        rel_var = self._comp_m2 / (self.count - 1) / np.maximum(self._comp_mean, 1e-300) ** 2
+        return 1.0 / np.maximum(rel_var, 1e-12)
+
+    @staticmethod
+    def _running_moments(x, count, mean, m2):
+        """
+        Running count, mean and M2 after each sample of x (along axis 0),
+        continuing from (count, mean, m2). Deviations are taken from the
+        previous mean so the cumulative sums stay well conditioned.
+        """
+        n = count + np.arange(1, len(x) + 1).reshape((-1,) + (1,) * (x.ndim - 1))
+        dev = x - mean
+        means = mean + np.cumsum(dev, axis=0) / n
+        m2s = m2 + np.cumsum(dev ** 2, axis=0) - n * (means - mean) ** 2
+        return n, means, m2s
+
+    def process(self, targets, comparisons):
+        """
+        Process a batch: targets (n,), comparisons (n,) or (n, n_comparison).
+        Returns a dict of (n,) arrays: ratio, mean, var, rms.
+        """
+        targets = np.asarray(targets, dtype=float)
+        comparisons = np.asarray(comparisons, dtype=float).reshape(len(targets), self.n_comparison)
+
+        # Weighted comparison ensemble, one matrix-vector product per batch
+        w = self._current_weights()
+        ratio = targets * w.sum() / (comparisons @ w)
+
+        if self.adaptive:
+            _, cm, cm2 = self._running_moments(comparisons, self.count, self._comp_mean, self._comp_m2)
+            self._comp_mean, self._comp_m2 = cm[-1], cm2[-1]
+
+        n, means, m2s = self._running_moments(ratio, self.count, self.mean, self.m2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.where(n > 1, m2s / (n - 1), 0.0)
+        self.count, self.mean, self.m2 = int(n[-1]), float(means[-1]), float(m2s[-1])
+
+        # Rolling RMS about the rolling mean, from windowed sums of the recent
+        # history plus this batch (shifted by the running mean for stability)
+        recent = np.concatenate([self._history, ratio]) - self.mean
+        s1 = np.concatenate([[0.0], np.cumsum(recent)])
+        s2 = np.concatenate([[0.0], np.cumsum(recent ** 2)])
+        stop = np.arange(len(self._history) + 1, len(recent) + 1)
+        start = np.maximum(stop - self.window, 0)
+        length = stop - start
+        window_mean = (s1[stop] - s1[start]) / length
+        rms = np.sqrt(np.maximum((s2[stop] - s2[start]) / length - window_mean ** 2, 0.0))
+        self._history = (recent[-(self.window - 1):] + self.mean if self.window > 1 else np.zeros(0))
+
+        return {"ratio": ratio, "mean": means, "var": var, "rms": rms}
+
+    def update(self, target, comparisons):
+        """Process a single sample; returns a dict of floats."""
+        result = self.process([target], np.reshape(comparisons, (1, -1)))
+        return {name: float(values[0]) for name, values in result.items()}
+
+    def stream(self, samples, batch_size=4096):
+        """
+        Consume an iterable of (target, comparisons) samples, e.g. from a
+        generator driven by the brightness simulations, and yield one result
+        dict of arrays per batch of up to batch_size samples.
+        """
+        targets = np.empty(batch_size)
+        comparisons = np.empty((batch_size, self.n_comparison))
+        filled = 0
+        for target, comps in samples:
+            targets[filled] = target
+            comparisons[filled] = comps
+            filled += 1
+            if filled == batch_size:
+                yield self.process(targets, comparisons)
+                filled = 0
+        if filled:
+            yield self.process(targets[:filled], comparisons[:filled])
+
+
+def differential_status(window=50):
+    """
+    Status line for the brightness simulations' fast mode: feeds each tick's
+    (comparison, target) brightness through a DifferentialPhotometer and
+    reports the ratio.
+    """
+    photometer = DifferentialPhotometer(window=window)
+
+    def status(brightnesses):
+        comparison, target = brightnesses
+        result = photometer.update(target, comparison)
+        return (f"Target / Comparison = {result['ratio']:.3f}   "
+                f"mean {result['mean']:.3f} ± {np.sqrt(result['var']):.3f}   "
+                f"rolling RMS ({window}) {result['rms']:.3f}")
+    return status
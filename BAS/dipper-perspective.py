@@ -1,6 +1,11 @@
-import math
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.lines as mlines
+from constellation_projection import (BIG_DIPPER, LITTLE_DIPPER, constellation_positions,
+                                      fit_to_box, project)
+
+# Where the "space view" is seen from: about 210 light-years from the Sun (x, y, z in ly)
+SPACE_OBSERVER = (-150.0, 150.0, 0.0)
 
 def transform_points(base_points, scale=1.0, rotation_deg=0.0, offset=(0.0, 0.0)):
     """
@@ -8,37 +13,17 @@ def transform_points(base_points, scale=1.0, rotation_deg=0.0, offset=(0.0, 0.0)
     2. Scale
     3. Rotate by rotation_deg about centroid
     4. Translate by offset
+    Works on all points at once and returns an (n, 2) array.
     """
-    # Compute centroid
-    xs = [p[0] for p in base_points]
-    ys = [p[1] for p in base_points]
-    centroid_x = sum(xs) / len(xs)
-    centroid_y = sum(ys) / len(ys)
-
-    # Convert rotation degrees to radians
-    theta = math.radians(rotation_deg)
-
-    transformed = []
-    for (x, y) in base_points:
-        # Translate to centroid
-        x_t = x - centroid_x
-        y_t = y - centroid_y
-
-        # Scale
-        x_s = x_t * scale
-        y_s = y_t * scale
-
-        # Rotate
-        x_r = x_s * math.cos(theta) - y_s * math.sin(theta)
-        y_r = x_s * math.sin(theta) + y_s * math.cos(theta)
+    points = np.asarray(base_points, dtype=float)
+    centroid = points.mean(axis=0)
 
-        # Translate back + offset
-        x_final = x_r + centroid_x + offset[0]
-        y_final = y_r + centroid_y + offset[1]
+    # Scale and rotation combined into one 2x2 matrix
+    theta = np.radians(rotation_deg)
+    rotation = scale * np.array([[np.cos(theta), -np.sin(theta)],
+                                 [np.sin(theta), np.cos(theta)]])
 
-        transformed.append((x_final, y_final))
-
-    return transformed
+    return (points - centroid) @ rotation.T + centroid + np.asarray(offset, dtype=float)
 
 def empty_black_squares_with_titles():
     # --- LEFT (EARTH VIEW) DIPPERS ---
@@ -69,31 +54,14 @@ def empty_black_squares_with_titles():
         offset=(0.9, 0.9)
     )
 
-    # --- RIGHT (SPACE VIEW) ZIGZAGS ---
-    # Rather than using the same shape, just define some
-    # arbitrary / somewhat-random zigzag lines:
-    
-    # "Little Dipper" on the right: random-ish zigzag
-    # (just some points that make a wiggly line)
-    little_dipper_pts_right = [
-        (0.5, 4.8),
-        (0.1, 2.2),
-        (1.7, 4.6),
-        (2.1, 3.9),
-        (2.6, 4.3),
-        (3.0, 3.7)
-    ]
-
-    # "Big Dipper" on the right: another random-ish zigzag
-    big_dipper_pts_right = [
-        (1.6, 2.8),
-        (1.2, 3.7),
-        (1.9, 3.3),
-        (2.5, 4.1),
-        (3.0, 3.5),
-        (3.4, 4.3),
-        (3.8, 3.9)
-    ]
+    # --- RIGHT (SPACE VIEW) ---
+    # The real 3-D positions of both dippers, seen from SPACE_OBSERVER and
+    # fitted into the same box as the Earth view. Nearby and distant stars
+    # shift by different amounts, so the familiar shapes fall apart.
+    stars = np.vstack([constellation_positions(LITTLE_DIPPER), constellation_positions(BIG_DIPPER)])
+    space_view = fit_to_box(project(stars, [SPACE_OBSERVER])[0], xlim=(0, 4), ylim=(2, 5.5))
+    little_dipper_pts_right = space_view[:len(LITTLE_DIPPER)]
+    big_dipper_pts_right = space_view[len(LITTLE_DIPPER):]
 
     # Create the figure and subplots (two black squares)
     fig, (ax_left, ax_right) = plt.subplots(1, 2, figsize=(8, 4))
@@ -136,11 +104,11 @@ def empty_black_squares_with_titles():
     ax_right.set_yticks([])
     ax_right.set_title("Big & Little Dipper - Space View", color="black", fontsize=12)
 
-    # Plot the "Little Dipper" zigzag on the right (yellow)
+    # Plot the Little Dipper on the right (yellow)
     x_ld_right, y_ld_right = zip(*little_dipper_pts_right)
     ax_right.plot(x_ld_right, y_ld_right, marker='o', color='yellow', markersize=5, linestyle='-')
 
-    # Plot the "Big Dipper" zigzag on the right (white)
+    # Plot the Big Dipper on the right (white)
     x_bd_right, y_bd_right = zip(*big_dipper_pts_right)
     ax_right.plot(x_bd_right, y_bd_right, marker='o', color='white', markersize=5, linestyle='-')
 
@@ -1,12 +1,16 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 from matplotlib.patches import Circle
+from light_curve import transit_flux
+from limb_darkening import limb_darkened_flux
+from scene import Scene, animate
+from curve_trace import LightCurveTrace
 
-def edge_on_transit_demo():
+def edge_on_transit_scene(limb_darkening=None):
     """
     A planet transits left->right in front of the star, then right->left behind the star.
     The light curve on the right resets each time.
+    Pass limb_darkening=(u1, u2) for a quadratic limb-darkened star instead of a uniform disk.
     Both subplots appear as black squares of the same physical size.
     We use manual label coordinates to bring x & y labels closer.
     """
@@ -21,26 +25,21 @@ def edge_on_transit_demo():
     frames = 200
     half = frames // 2
 
-    time_data = []
-    flux_data = []
-
-    star_area = np.pi * (R_star**2)
-    planet_area = np.pi * (R_planet**2)
-    max_block_fraction = planet_area / star_area
-
-    def compute_flux(planet_x):
-        dist = abs(planet_x)
-        sum_r = R_star + R_planet
-        diff_r = abs(R_star - R_planet)
-        if dist >= sum_r:
-            return 1.0
-        elif dist <= diff_r:
-            return 1.0 - max_block_fraction
-        else:
-            overlap_range = sum_r - diff_r
-            overlap_dist = sum_r - dist
-            coverage_fraction = overlap_dist / overlap_range
-            return 1.0 - coverage_fraction * max_block_fraction
+    # Precompute the planet track and the whole light curve once:
+    # first half in front of the star (left->right), second half behind it
+    frame_idx = np.arange(frames)
+    in_front = frame_idx < half
+    frac = np.where(in_front, frame_idx, frame_idx - half) / (half - 1)
+    planet_xs = np.where(in_front,
+                         x_left + (x_right - x_left) * frac,
+                         x_right + (x_left - x_right) * frac)
+    if limb_darkening is None:
+        flux_curve = transit_flux(planet_xs, R_planet, r_star=R_star, in_front=in_front)
+    else:
+        flux_curve = np.where(in_front,
+                              limb_darkened_flux(np.abs(planet_xs) / R_star, R_planet / R_star,
+                                                 *limb_darkening),
+                              1.0)
 
     fig, (ax_left, ax_right) = plt.subplots(1, 2, figsize=(8, 4))
 
@@ -65,6 +64,7 @@ def edge_on_transit_demo():
     ax_right.set_title("Observed Flux vs Time", color="black", fontsize=12)
 
     (flux_line,) = ax_right.plot([], [], color='cyan', lw=2)
+    flux_trace = LightCurveTrace(flux_line, capacity=frames)
 
     # 1) Remove default padding:
     ax_right.set_xlabel("Time", color="black", labelpad=0)
@@ -79,45 +79,31 @@ def edge_on_transit_demo():
     ax_right.yaxis.set_label_coords(-0.008, 0.5)
 
     def init():
-        time_data.clear()
-        flux_data.clear()
-        flux_line.set_data([], [])
-        return flux_line,
+        flux_trace.reset()
+        return star_patch, planet_patch, flux_line
 
     def update(frame):
-        if frame < half:
-            frac = frame / (half - 1)
-            planet_x = x_left + (x_right - x_left) * frac
-            planet_patch.set_zorder(3)
-            flux = compute_flux(planet_x)
-        else:
-            frac = (frame - half) / (half - 1)
-            planet_x = x_right + (x_left - x_right) * frac
-            planet_patch.set_zorder(1)
-            flux = 1.0
+        planet_x = planet_xs[frame]
+        planet_patch.set_zorder(3 if in_front[frame] else 1)
+        flux = flux_curve[frame]
 
         planet_patch.center = (planet_x, 0)
-        time_data.append(frame)
-        flux_data.append(flux)
-
-        flux_line.set_xdata(time_data)
-        flux_line.set_ydata(flux_data)
-        return planet_patch, flux_line
-
-    ani = FuncAnimation(
-        fig,
-        update,
-        frames=frames,
-        init_func=init,
-        interval=50,
-        blit=False,
-        repeat=True
-    )
+        flux_trace.append(frame, flux)
+
+        # The star is returned too so that blitting redraws it over the
+        # planet while the planet is behind it
+        return star_patch, planet_patch, flux_trace.publish()
 
     # If you find tight_layout re-adjusts the labels too much,
     # comment the next line out or tweak subplots_adjust manually.
-    plt.tight_layout()
+    fig.tight_layout()
 
+    return Scene(fig, update, init, frames, interval=50)
+
+def edge_on_transit_demo():
+    """Run the edge-on transit animation in an interactive window."""
+    scene = edge_on_transit_scene()
+    ani = animate(scene, blit=True)
     plt.show()
 
 if __name__ == "__main__":
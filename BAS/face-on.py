@@ -1,9 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from matplotlib.patches import Circle
+from light_curve import transit_flux
+from orbits import orbit_positions
+from scene import Scene, animate
+from curve_trace import LightCurveTrace
+from system_view import SystemView
 
-def exoplanet_transit_simulation():
+def exoplanet_transit_scene():
     """
     Demonstrates a simple star+planet orbit system (face-on):
       - Left subplot: star & orbiting planet
@@ -20,10 +23,6 @@ def exoplanet_transit_simulation():
     orbit_radius = 2.0  # Distance from star center to planet center
     period_frames = 100 # Frames per orbit in the animation
 
-    # Arrays for the light-curve
-    time_data = []
-    flux_data = []
-
     # -----------------------
     # FIGURE & SUBPLOTS
     # -----------------------
@@ -41,11 +40,8 @@ def exoplanet_transit_simulation():
     ax_left.set_yticks([])
     ax_left.set_title('Face-On Orbit (No Blocking of Light)', color='black', fontsize=12)
 
-    # Draw the star and planet
-    star_patch = Circle((0, 0), R_star, color='yellow')
-    ax_left.add_patch(star_patch)
-    planet_patch = Circle((orbit_radius, 0), R_planet, color='white')
-    ax_left.add_patch(planet_patch)
+    # Draw the star and planet as one collection (star first, planet on top)
+    bodies = SystemView(ax_left, [R_star, R_planet], ['yellow', 'white'])
 
     # -----------------------
     # RIGHT SUBPLOT (Light Curve)
@@ -69,63 +65,48 @@ def exoplanet_transit_simulation():
 
     # Prepare the line for flux
     (flux_line,) = ax_right.plot([], [], color='cyan', lw=2)
+    flux_trace = LightCurveTrace(flux_line, capacity=period_frames + 1)
 
-    # Star & Planet areas (for flux dip calc)
-    star_area = np.pi * (R_star ** 2)
-    planet_area = np.pi * (R_planet ** 2)
-    transit_depth = planet_area / star_area  # Fraction of star blocked
+    # Precompute the orbit and the light curve for every frame.
+    # Flux comes from the exact overlap of the planet and star disks.
+    frame_idx = np.arange(period_frames + 1)
+    planet_xs, planet_ys, _ = orbit_positions(frame_idx, period_frames, orbit_radius)
+    flux_curve = transit_flux(planet_xs, R_planet, impact=planet_ys, r_star=R_star)
+    body_offsets = np.zeros((len(frame_idx), 2, 2))  # (frame, body, xy); the star stays at the origin
+    body_offsets[:, 1, 0], body_offsets[:, 1, 1] = planet_xs, planet_ys
+    bodies.update(body_offsets[0])
 
     # -----------------------
     # INIT FUNCTION (to reset the line each loop)
     # -----------------------
     def init():
         """Clears old line data so the flux plot restarts each time the animation loops."""
-        time_data.clear()
-        flux_data.clear()
-        flux_line.set_data([], [])
-        return flux_line,
+        flux_trace.reset()
+        return bodies.collection, flux_line
 
     # -----------------------
     # UPDATE FUNCTION
     # -----------------------
     def update(frame):
-        # Planet's angular position in one orbit
-        angle = 2.0 * np.pi * (frame / period_frames)
-
-        # Planet's (x,y)
-        px = orbit_radius * np.cos(angle)
-        py = orbit_radius * np.sin(angle)
-        planet_patch.center = (px, py)
-
-        # Simple check for transit
-        if abs(px) < (R_star + R_planet) and abs(py) < 0.1:
-            flux = 1.0 - transit_depth
-        else:
-            flux = 1.0
+        # Planet's (x,y) and flux, looked up from the precomputed arrays
+        bodies.update(body_offsets[frame])
+        flux = flux_curve[frame]
 
         # Record flux data
-        time_data.append(frame)
-        flux_data.append(flux)
-        flux_line.set_xdata(time_data)
-        flux_line.set_ydata(flux_data)
-
-        return planet_patch, flux_line
+        flux_trace.append(frame, flux)
 
-    # -----------------------
-    # RUN ANIMATION
-    # -----------------------
-    ani = FuncAnimation(
-        fig,
-        update,
-        frames=range(period_frames + 1),
-        init_func=init,   # <-- This resets the flux line on each new loop
-        interval=100,
-        blit=False,
-        repeat=True
-    )
+        return bodies.collection, flux_trace.publish()
 
     # If you find tight_layout repositions labels too aggressively, feel free to remove:
-    plt.tight_layout()
+    fig.tight_layout()
+
+    # init resets the flux line on each new loop
+    return Scene(fig, update, init, period_frames + 1, interval=100)
+
+def exoplanet_transit_simulation():
+    """Run the face-on orbit animation in an interactive window."""
+    scene = exoplanet_transit_scene()
+    ani = animate(scene, blit=True)
     plt.show()
 
 if __name__ == "__main__":
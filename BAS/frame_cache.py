@@ -0,0 +1,197 @@
+"""
+Rendered-frame cache for looping animations.
+
+The demos precompute their physics (positions, fluxes, colours) into arrays
+when the scene is built, so update(frame) is only lookups; what still costs
+CPU on every loop is drawing identical frames again. A FrameCache keeps the
+rendered RGBA pixels of each frame (canvas.copy_from_bbox) in an LRU bounded
+by a byte budget, and a cached animation plays every frame it has already
+drawn with restore_region + blit: no update, no artist drawing. Once the
+whole loop fits in the budget, a looping kiosk display does little more than
+copy bitmaps.
+
+Frames are keyed by (frame, canvas size), so resizing the window simply
+renders (and caches) the frames again. When the budget holds only part of the
+loop, a frame that has to be drawn after skipped ones first replays init()
+and the cheap updates since the start of the loop, so scenes that accumulate
+state (the light-curve traces) stay consistent.
+
+Nothing changes unless asked for: scene.animate(scene, cache=FrameCache())
+switches to the cached animation.
+
+Example:
+    python frame_cache.py face-on --loops 3 --max-mb 256
+    python frame_cache.py star-wobble --live
+"""
+import argparse
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def region_nbytes(region):
+    """Bytes of RGBA pixels in a canvas BufferRegion."""
+    x0, y0, x1, y1 = region.get_extents()
+    return 4 * (x1 - x0) * (y1 - y0)
+
+
+class FrameCache:
+    """
+    Rendered frames bounded by max_bytes of pixel data.
+
+    policy "lru" evicts the least recently used frames to make room. A loop
+    that is longer than the budget defeats LRU (every frame is evicted just
+    before it is needed again), so policy "retain" instead keeps the frames it
+    has and stops admitting new ones once full: a fixed share of the loop is
+    then replayed from the cache on every pass.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, policy="lru"):
+        if policy not in ("lru", "retain"):
+            raise ValueError("policy must be 'lru' or 'retain'")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.items = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key):
+        region = self.items.get(key)
+        if region is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return region
+
+    def put(self, key, region):
+        size = region_nbytes(region)
+        if size > self.max_bytes:
+            return
+        if key in self.items:
+            self.nbytes -= region_nbytes(self.items.pop(key))
+        if self.policy == "retain" and self.nbytes + size > self.max_bytes:
+            return
+        while self.items and self.nbytes + size > self.max_bytes:
+            _, evicted = self.items.popitem(last=False)
+            self.nbytes -= region_nbytes(evicted)
+        self.items[key] = region
+        self.nbytes += size
+
+    def clear(self):
+        self.items.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {"frames": len(self.items), "bytes": self.nbytes, "max_bytes": self.max_bytes, "policy": self.policy,
+                "hits": self.hits, "misses": self.misses}
+
+
+def cached_animation(scene, cache, blit=False, repeat=True, timer=None):
+    """
+    FuncAnimation for scene that plays frames found in cache by blitting
+    their bitmaps, and renders and caches the others. With a
+    frame_timing.FrameTimer, updates and draws (cached or not) are recorded.
+    """
+    from matplotlib.animation import FuncAnimation
+
+    if timer is not None:
+        from frame_timing import PHASES, instrument
+        scene = instrument(scene, timer)
+        draw_phase = PHASES.index("draw")
+    canvas = scene.fig.canvas
+    state = {"updated": None}  # last frame whose update() the scene's state reflects
+
+    def init():
+        state["updated"] = None
+        return scene.init()
+
+    def update(frame):
+        # A cache hit skips update(), so catch the scene's state up first
+        expected = 0 if state["updated"] is None else state["updated"] + 1
+        if frame != expected:
+            if scene.init is not None:
+                scene.init()
+            for skipped in range(frame):
+                scene.update(skipped)
+        state["updated"] = frame
+        return scene.update(frame)
+
+    class CachedFuncAnimation(FuncAnimation):
+        def _draw_next_frame(self, framedata, blit):
+            start = time.perf_counter()
+            key = (framedata, canvas.get_width_height())
+            region = cache.get(key)
+            if region is None:
+                super()._draw_next_frame(framedata, blit)
+                cache.put(key, canvas.copy_from_bbox(scene.fig.bbox))
+            else:
+                canvas.restore_region(region)
+                canvas.blit(scene.fig.bbox)
+            if timer is not None:
+                timer.record(draw_phase, start, time.perf_counter(), frame=framedata)
+
+        def _post_draw(self, framedata, blit):
+            if framedata is None or blit:
+                super()._post_draw(framedata, blit)
+            else:
+                # Draw now rather than idly, so the buffer holds this frame when it is cached
+                canvas.draw()
+
+    return CachedFuncAnimation(scene.fig, update, frames=scene.frames,
+                               init_func=None if scene.init is None else init,
+                               interval=scene.interval, blit=blit, repeat=repeat)
+
+
+def main():
+    from demos import SCENES, build_scene
+    parser = argparse.ArgumentParser(description="Play an animated demo through the rendered-frame cache.")
+    parser.add_argument("name", choices=sorted(SCENES))
+    parser.add_argument("--loops", type=int, default=3, help="loops to play headless")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20, help="cache budget in MiB")
+    parser.add_argument("--retain", action="store_true",
+                        help="keep the first frames once the cache is full instead of LRU eviction")
+    parser.add_argument("--live", action="store_true", help="run the interactive animation with the cache")
+    parser.add_argument("--no-blit", action="store_true")
+    args = parser.parse_args()
+
+    cache = FrameCache(int(args.max_mb * 2**20), "retain" if args.retain else "lru")
+    if args.live:
+        import matplotlib.pyplot as plt
+        from scene import animate
+        scene = build_scene(args.name)
+        ani = animate(scene, blit=not args.no_blit, cache=cache)
+        plt.show()
+        print(cache.stats())
+        return
+
+    from frame_export import use_agg
+    use_agg()
+    scene = build_scene(args.name)
+    blit = not args.no_blit
+    ani = cached_animation(scene, cache, blit=blit, repeat=False)
+    ani._init_draw()
+    scene.fig.canvas.draw()  # the background, as the first draw of a window would
+    for loop in range(args.loops):
+        start = time.perf_counter()
+        if loop:
+            ani._init_draw()
+        for frame in range(scene.frames):
+            ani._draw_next_frame(frame, blit)
+        elapsed = time.perf_counter() - start
+        stats = cache.stats()
+        print(f"loop {loop + 1}: {elapsed / scene.frames * 1e3:6.2f} ms/frame, "
+              f"{stats['frames']} frames cached ({stats['bytes'] / 2**20:.0f} MiB), "
+              f"{stats['hits']} hits, {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
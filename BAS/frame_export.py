@@ -0,0 +1,173 @@
+"""
+Headless export of the FuncAnimation demos to MP4, GIF or a PNG sequence.
+
+Every frame is rendered with the Agg backend. The frame range is split into
+contiguous blocks that are rendered in parallel by a process pool; each worker
+builds its own copy of the scene, replays update() up to the start of its block
+(cheap, no drawing) so the orbital state is known, then draws its frames.
+Blocks are at most MAX_BLOCK_FRAMES long and only a few are in flight at a
+time; the parent hands their frames to the encoder as they arrive, so the raw
+frames of the whole animation are never held at once.
+
+Example:
+    python frame_export.py edge-on edge-on.mp4 --workers 8
+    python frame_export.py star-wobble frames/ --dpi 150
+"""
+import argparse
+import itertools
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+
+from demos import SCENES, build_scene
+
+VIDEO_FORMATS = ("mp4", "gif")
+MAX_BLOCK_FRAMES = 16  # frames a worker renders (and holds) per block
+
+
+def use_agg():
+    """Switch matplotlib to the headless Agg backend and return pyplot."""
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _render_block(name, start, stop, dpi, png_dir, scene_kwargs):
+    """
+    Worker: render frames [start, stop) of one demo.
+    Writes PNGs into png_dir if given (returns the count), otherwise returns
+    the frames as a list of (H, W, 3) uint8 arrays.
+    """
+    plt = use_agg()
+    scene = build_scene(name, **scene_kwargs)
+    fig = scene.fig
+    if dpi is not None:
+        fig.set_dpi(dpi)
+
+    # Bring the animation state up to the first frame of this block
+    if scene.init is not None:
+        scene.init()
+    for frame in range(start):
+        scene.update(frame)
+
+    frames = []
+    for frame in range(start, stop):
+        scene.update(frame)
+        if png_dir is not None:
+            fig.savefig(os.path.join(png_dir, f"frame_{frame:05d}.png"), dpi=fig.dpi)
+        else:
+            fig.canvas.draw()
+            frames.append(np.asarray(fig.canvas.buffer_rgba())[..., :3].copy())
+
+    plt.close(fig)
+    return stop - start if png_dir is not None else frames
+
+
+def _imap(pool, func, args, window):
+    """
+    pool.map(func, *zip(*args)) in order, but lazily: at most `window` calls
+    are submitted ahead of the one being consumed, so finished blocks of
+    frames never pile up in the parent.
+    """
+    args = iter(args)
+    pending = deque(pool.submit(func, *a) for a in itertools.islice(args, window))
+    while pending:
+        result = pending.popleft().result()
+        pending.extend(pool.submit(func, *a) for a in itertools.islice(args, 1))
+        yield result
+
+
+def _frame_blocks(n_frames, n_blocks):
+    edges = np.linspace(0, n_frames, min(n_blocks, n_frames) + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _find_ffmpeg():
+    ffmpeg = shutil.which(matplotlib.rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise RuntimeError("MP4 export needs ffmpeg on the PATH "
+                           "(or set rcParams['animation.ffmpeg_path'])")
+    return ffmpeg
+
+
+def _open_ffmpeg(ffmpeg, path, width, height, fps):
+    cmd = [ffmpeg, "-y", "-loglevel", "error",
+           "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+           "-r", str(fps), "-i", "-",
+           "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",  # yuv420p needs even sizes
+           "-pix_fmt", "yuv420p", "-vcodec", "libx264", path]
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+
+def export_demo(name, path, workers=None, fps=None, dpi=None, blocks_per_worker=2, **scene_kwargs):
+    """
+    Render every frame of demo `name` (a key of demos.SCENES) to `path`.
+
+    The output format follows the file suffix: '.mp4' or '.gif' give a video,
+    anything else is treated as a directory for a 'frame_00000.png' sequence.
+    fps defaults to the demo's own interval. Extra keyword arguments are passed
+    to the scene builder.
+    """
+    plt = use_agg()
+    fmt = os.path.splitext(path)[1].lower().lstrip(".")
+    png_dir = None if fmt in VIDEO_FORMATS else path
+    if png_dir is not None:
+        os.makedirs(png_dir, exist_ok=True)
+    ffmpeg = _find_ffmpeg() if fmt == "mp4" else None
+
+    # Build one copy here just to learn the frame count and timing
+    scene = build_scene(name, **scene_kwargs)
+    n_frames, interval = scene.frames, scene.interval
+    plt.close(scene.fig)
+    if fps is None:
+        fps = 1000.0 / interval
+
+    workers = workers or os.cpu_count() or 1
+    n_blocks = max(workers * blocks_per_worker, -(-n_frames // MAX_BLOCK_FRAMES))
+    blocks = _frame_blocks(n_frames, n_blocks)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_agg) as pool:
+        results = _imap(pool, _render_block, [(name, start, stop, dpi, png_dir, scene_kwargs)
+                                              for start, stop in blocks], window=2 * workers)
+        if png_dir is not None:
+            for _ in results:
+                pass
+        elif fmt == "gif":
+            from PIL import Image
+            # Pillow pulls the frames one at a time and keeps only paletted deltas
+            images = (Image.fromarray(rgb) for block in results for rgb in block)
+            next(images).save(path, save_all=True, append_images=images,
+                              duration=int(round(1000.0 / fps)), loop=0)
+        else:
+            writer = None
+            for block in results:
+                for rgb in block:
+                    if writer is None:
+                        writer = _open_ffmpeg(ffmpeg, path, rgb.shape[1], rgb.shape[0], fps)
+                    writer.stdin.write(rgb.tobytes())
+            writer.stdin.close()
+            if writer.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed while writing {path}")
+    return n_frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a BAS animation headless to MP4, GIF or PNGs.")
+    parser.add_argument("demo", choices=sorted(SCENES))
+    parser.add_argument("output", help="out.mp4, out.gif, or a directory for a PNG sequence")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--fps", type=float, default=None, help="frame rate (default: the demo's interval)")
+    parser.add_argument("--dpi", type=float, default=None, help="render resolution")
+    args = parser.parse_args()
+
+    n = export_demo(args.demo, args.output, workers=args.workers, fps=args.fps, dpi=args.dpi)
+    print(f"Wrote {n} frames of {args.demo} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
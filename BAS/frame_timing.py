@@ -0,0 +1,260 @@
+"""
+Opt-in per-frame instrumentation for the FuncAnimation demos.
+
+A FrameTimer records how long each phase of each frame takes:
+
+    init         the scene's init() (once per loop)
+    update       the scene's update(frame): physics lookups and artist changes
+    draw         from the end of update() until the frame is on the canvas:
+                 drawing and blitting the changed artists, or, when not
+                 blitting, until the canvas draw that shows it
+    canvas_draw  full canvas draws, including the ones a GUI backend defers
+                 to its event loop (attributed to the most recent frame)
+
+Records go into a preallocated structured array used as a ring buffer, so a
+long-running display keeps the most recent `capacity` records without
+allocating. report() gives p50/p95/p99 frame times and the frames that missed
+the requested interval, and write_chrome_trace() exports a timeline that
+chrome://tracing or Perfetto can open.
+
+Nothing here is active unless asked for: scene.animate(scene, timer=FrameTimer())
+switches to the instrumented animation, and without a timer the demos run the
+plain FuncAnimation with no extra work per frame.
+
+Example:
+    python frame_timing.py edge-on --frames 400 --trace edge-on-trace.json
+    python frame_timing.py star-wobble --live --seconds 10
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+PHASES = ("init", "update", "draw", "canvas_draw")
+
+RECORD_DTYPE = np.dtype([
+    ("frame", "<i8"),
+    ("phase", "<u1"),       # index into PHASES
+    ("start", "<f8"),       # perf_counter seconds
+    ("duration", "<f8"),    # seconds
+])
+
+
+class FrameTimer:
+    """
+    Ring buffer of (frame, phase, start, duration) records.
+    interval is the frame interval the animation asks for, in ms.
+    """
+
+    def __init__(self, capacity=100_000, interval=None):
+        self.records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self.capacity = capacity
+        self.interval = interval
+        self.count = 0
+        self.frame = -1
+        self.origin = time.perf_counter()
+
+    def record(self, phase, start, stop, frame=None):
+        i = self.count % self.capacity
+        self.records[i] = (self.frame if frame is None else frame, phase, start, stop - start)
+        self.count += 1
+
+    def timed(self, phase, func, frame_arg=False):
+        """Wrap func so each call is recorded under `phase`."""
+        phase = PHASES.index(phase)
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            if frame_arg:
+                self.frame = args[0]
+            start = clock()
+            result = func(*args, **kwargs)
+            self.record(phase, start, clock())
+            return result
+        return wrapper
+
+    def reset(self):
+        self.count = 0
+        self.frame = -1
+
+    def snapshot(self):
+        """The buffered records, oldest first."""
+        if self.count <= self.capacity:
+            return self.records[:self.count].copy()
+        split = self.count % self.capacity
+        return np.concatenate([self.records[split:], self.records[:split]])
+
+    def frame_table(self):
+        """
+        One row per recorded update: (frame, start, update, draw, canvas_draw)
+        as a dict of arrays; draw phases are summed onto the update they follow.
+        """
+        records = self.snapshot()
+        updates = np.flatnonzero(records["phase"] == PHASES.index("update"))
+        # Each record belongs to the most recent update at or before it
+        owner = np.searchsorted(updates, np.arange(len(records)), side="right") - 1
+        table = {"frame": records["frame"][updates], "start": records["start"][updates]}
+        for phase in ("update", "draw", "canvas_draw"):
+            selected = (records["phase"] == PHASES.index(phase)) & (owner >= 0)
+            table[phase] = np.bincount(owner[selected], weights=records["duration"][selected],
+                                       minlength=len(updates))
+        return table
+
+    def report(self, interval=None):
+        """
+        Summary statistics in milliseconds.
+
+        busy   : update plus the larger of draw and canvas_draw of each frame
+                 (a non-blitting draw can contain the canvas draw itself)
+        period : time from one frame's update to the next one's (what a
+                 viewer sees when the animation runs live)
+        missed : frame slots lost, i.e. sum of round(period / interval) - 1
+                 over frames that arrived late
+        """
+        interval = self.interval if interval is None else interval
+        table = self.frame_table()
+        busy = (table["update"] + np.maximum(table["draw"], table["canvas_draw"])) * 1e3
+        period = np.diff(table["start"]) * 1e3
+        result = {"frames": len(busy)}
+        for name, values in (("update", table["update"] * 1e3), ("draw", table["draw"] * 1e3),
+                             ("canvas_draw", table["canvas_draw"] * 1e3),
+                             ("busy", busy), ("period", period)):
+            if len(values):
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                result[name] = {"p50": p50, "p95": p95, "p99": p99, "max": float(values.max())}
+        if interval and len(busy):
+            result["interval"] = interval
+            result["over_budget"] = int((busy > interval).sum())
+            result["missed"] = int(np.maximum(np.round(period / interval) - 1, 0).sum())
+        return result
+
+    def write_chrome_trace(self, path):
+        """Write the buffered records as Chrome trace-event JSON ("X" complete events)."""
+        records = self.snapshot()
+        events = [{"name": PHASES[phase], "cat": "frame", "ph": "X",
+                   "ts": (start - self.origin) * 1e6, "dur": duration * 1e6,
+                   "pid": 1, "tid": 1, "args": {"frame": int(frame)}}
+                  for frame, phase, start, duration in records.tolist()]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+def instrument(scene, timer):
+    """
+    Return a copy of scene whose update/init record into timer, and hook the
+    figure's canvas draw. Sets timer.interval from the scene if it is unset.
+    """
+    if timer.interval is None:
+        timer.interval = scene.interval
+    canvas = scene.fig.canvas
+    if not getattr(canvas, "_frame_timer_hooked", False):
+        canvas.draw = timer.timed("canvas_draw", canvas.draw)
+        canvas._frame_timer_hooked = True
+    init = None if scene.init is None else timer.timed("init", scene.init)
+    return scene._replace(update=timer.timed("update", scene.update, frame_arg=True), init=init)
+
+
+def timed_animation(scene, timer, blit=False, repeat=True):
+    """
+    FuncAnimation for an instrumented scene that also times the draw of each
+    frame: from the end of its update until the frame reaches the canvas,
+    through canvas.blit when blitting or the figure's draw_event otherwise.
+    """
+    from matplotlib.animation import FuncAnimation
+
+    scene = instrument(scene, timer)
+    canvas = scene.fig.canvas
+    draw_phase = PHASES.index("draw")
+    pending = {"start": None}  # end of the update whose frame is not on the canvas yet
+
+    def update(frame):
+        result = scene.update(frame)
+        pending["start"] = time.perf_counter()
+        return result
+
+    def flushed(*args):
+        if pending["start"] is not None:
+            timer.record(draw_phase, pending["start"], time.perf_counter())
+            pending["start"] = None
+
+    def timed_blit(*args, **kwargs):
+        result = blit_canvas(*args, **kwargs)
+        flushed()
+        return result
+
+    if blit:
+        blit_canvas = canvas.blit
+        canvas.blit = timed_blit
+    canvas.mpl_connect("draw_event", flushed)
+    return FuncAnimation(scene.fig, update, frames=scene.frames,
+                         init_func=scene.init, interval=scene.interval,
+                         blit=blit, repeat=repeat)
+
+
+def profile_headless(scene, timer, n_frames=None):
+    """
+    Drive a scene without an event loop: update and a full Agg canvas draw
+    per frame, looping (with init) like a repeating animation.
+    """
+    scene = instrument(scene, timer)
+    n_frames = scene.frames if n_frames is None else n_frames
+    for i in range(n_frames):
+        frame = i % scene.frames
+        if frame == 0 and scene.init is not None:
+            scene.init()
+        scene.update(frame)
+        scene.fig.canvas.draw()  # recorded as canvas_draw by the hook
+    return timer
+
+
+def format_report(report):
+    lines = [f"{report['frames']} frames"]
+    for name in ("update", "draw", "canvas_draw", "busy", "period"):
+        if name in report:
+            stats = report[name]
+            lines.append(f"  {name:12s} p50 {stats['p50']:7.2f}  p95 {stats['p95']:7.2f}  "
+                         f"p99 {stats['p99']:7.2f}  max {stats['max']:7.2f} ms")
+    if "interval" in report:
+        lines.append(f"  {report['over_budget']} frames took longer than the {report['interval']} ms "
+                     f"interval; {report['missed']} frame slots missed")
+    return "\n".join(lines)
+
+
+def main():
+    from demos import SCENES, build_scene
+    parser = argparse.ArgumentParser(description="Per-frame timing of an animated demo.")
+    parser.add_argument("name", choices=sorted(SCENES))
+    parser.add_argument("--frames", type=int, default=None, help="frames to render headless")
+    parser.add_argument("--live", action="store_true",
+                        help="run the interactive animation and report when the window closes")
+    parser.add_argument("--seconds", type=float, default=None, help="close the live window after this long")
+    parser.add_argument("--no-blit", action="store_true")
+    parser.add_argument("--trace", help="write a Chrome trace JSON timeline to this file")
+    args = parser.parse_args()
+
+    timer = FrameTimer()
+    if args.live:
+        import matplotlib.pyplot as plt
+        from scene import animate
+        scene = build_scene(args.name)
+        ani = animate(scene, blit=not args.no_blit, timer=timer)
+        if args.seconds:
+            close = scene.fig.canvas.new_timer(interval=int(args.seconds * 1000))
+            close.add_callback(plt.close, scene.fig)
+            close.start()
+        plt.show()
+    else:
+        from frame_export import use_agg
+        use_agg()
+        profile_headless(build_scene(args.name), timer, args.frames)
+
+    print(format_report(timer.report()))
+    if args.trace:
+        n = timer.write_chrome_trace(args.trace)
+        print(f"Wrote {n} trace events to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
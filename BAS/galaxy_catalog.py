@@ -0,0 +1,235 @@
+"""
+Galaxy catalog with vectorized coordinate parsing and a cone-search index.
+
+perspective/galaxies.csv stores RA as "hh mm.m" and Dec as "+dd mm" text.
+Here whole columns are converted to float64 degrees at once, turned into unit
+vectors, and bucketed into a regular 3-D grid of cells so that cone searches
+and nearest-neighbour queries only look at the handful of cells near the query
+point instead of scanning every row.
+"""
+import os
+import warnings
+
+import numpy as np
+
+BAS_DIR = os.path.dirname(os.path.abspath(__file__))
+GALAXIES_CSV = os.path.join(BAS_DIR, "perspective", "galaxies.csv")
+
+
+# -------------------------
+# SEXAGESIMAL PARSING
+# -------------------------
+def _field_counts(strings):
+    """Number of whitespace-separated fields in each string of a flat str array."""
+    width = strings.dtype.itemsize // 4
+    if width == 0:
+        return np.zeros(len(strings), dtype=np.int64)
+    # The fixed-width UCS4 column as an (n, width) array of code points
+    codes = np.ascontiguousarray(strings).view(np.uint32).reshape(len(strings), width)
+    text = codes > 32  # not a space, tab, other control character or NUL padding
+    # A field starts wherever text follows whitespace (or the start of the string)
+    starts = text.copy()
+    starts[:, 1:] &= ~text[:, :-1]
+    return starts.sum(axis=1)
+
+
+def _sexagesimal_fields(strings):
+    """
+    Split an array of "a b[ c]" strings into an (n, fields) float array.
+    Fields are counted on the whole column at once and the numbers are parsed
+    by one C-level call instead of one split per row.
+    """
+    strings = np.asarray(strings, dtype=str)
+    if strings.size == 0:
+        return np.zeros(strings.shape + (2,))
+    flat = strings.ravel()
+
+    # Every row must have the same number of fields: the most common of 2 / 3
+    counts = _field_counts(flat)
+    fields = 3 if np.count_nonzero(counts == 3) > np.count_nonzero(counts == 2) else 2
+    bad = np.flatnonzero(counts != fields)
+    if bad.size == 0:
+        try:
+            with warnings.catch_warnings():
+                # Unparsable text stops fromstring early (a DeprecationWarning for now)
+                warnings.simplefilter("ignore", DeprecationWarning)
+                values = np.fromstring(" ".join(flat.tolist()), sep=" ")
+        except ValueError:
+            values = np.empty(0)
+        if values.size == counts.sum():
+            return values.reshape(strings.shape + (fields,))
+        # A field that is not a number; find the rows it is in
+        bad = np.array([i for i, s in enumerate(flat) if not _all_numbers(s)])
+    raise ValueError("coordinates must all be 'a b' or all 'a b c' (degrees/hours, minutes[, seconds]); "
+                     f"could not parse rows {bad[:5].tolist()}: {flat[bad[:5]].tolist()}")
+
+
+def _all_numbers(text):
+    try:
+        [float(field) for field in text.split()]
+    except ValueError:
+        return False
+    return True
+
+
+def _to_units(fields):
+    units = fields[..., 0] + fields[..., 1] / 60.0
+    if fields.shape[-1] == 3:
+        units = units + fields[..., 2] / 3600.0
+    return units
+
+
+def parse_ra(strings):
+    """Parse RA strings like "11 11.2" or "11 11 12" into degrees (float64)."""
+    return 15.0 * _to_units(_sexagesimal_fields(strings))
+
+
+def parse_dec(strings):
+    """Parse Dec strings like "+28 42", "-05 30" or "+ 21 41" into degrees (float64)."""
+    strings = np.char.strip(np.asarray(strings, dtype=str))
+    # The sign is taken from the first character so that "-00 30" stays negative
+    sign = np.where(np.char.startswith(strings, "-"), -1.0, 1.0)
+    unsigned = np.char.replace(np.char.replace(strings, "+", " "), "-", " ")
+    return sign * _to_units(_sexagesimal_fields(unsigned))
+
+
+def radec_to_unit(ra_deg, dec_deg):
+    """Unit vectors (n, 3) for RA/Dec in degrees."""
+    ra, dec = np.radians(ra_deg), np.radians(dec_deg)
+    cos_dec = np.cos(dec)
+    return np.stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)], axis=-1)
+
+
+# -------------------------
+# SPATIAL INDEX
+# -------------------------
+class SkyIndex:
+    """
+    Cone-search and nearest-neighbour index over unit vectors.
+
+    Points are bucketed into cubic cells of side `cell_size` (in chord units,
+    covering [-1, 1]^3) and sorted by cell key, so the points of any cell are
+    one contiguous slice found with searchsorted. A query only visits the
+    cells that can intersect the query sphere and then checks exact angles.
+    """
+
+    def __init__(self, unit_vectors, cell_size=None, points_per_cell=8):
+        self.xyz = np.ascontiguousarray(unit_vectors, dtype=float)
+        n = max(len(self.xyz), 1)
+        if cell_size is None:
+            # The sphere's area (4 pi) spread over cells of area cell_size^2
+            cell_size = np.sqrt(4.0 * np.pi * points_per_cell / n)
+        self.cell_size = min(cell_size, 2.0)
+        self.cells_per_axis = int(np.ceil(2.0 / self.cell_size)) + 1
+
+        keys = self._keys(self._cell_coords(self.xyz))
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        self.sorted_xyz = self.xyz[self.order]
+
+    def __len__(self):
+        return len(self.xyz)
+
+    def _cell_coords(self, xyz):
+        return np.floor((xyz + 1.0) / self.cell_size).astype(np.int64)
+
+    def _keys(self, coords):
+        m = self.cells_per_axis
+        return (coords[..., 0] * m + coords[..., 1]) * m + coords[..., 2]
+
+    def _candidates(self, center, chord):
+        """Positions (into the sorted arrays) of all points in cells within `chord` of center."""
+        lo = np.maximum(self._cell_coords(center - chord), 0)
+        hi = np.minimum(self._cell_coords(center + chord), self.cells_per_axis - 1)
+        n_cells = np.prod(hi - lo + 1)
+        if n_cells > len(self) // 4:
+            return np.arange(len(self))  # a huge cone: scanning everything is cheaper
+
+        axes = [np.arange(a, b + 1) for a, b in zip(lo, hi)]
+        coords = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+        # Drop cells whose closest point is further than chord from the center
+        cell_lo = coords * self.cell_size - 1.0
+        nearest = np.clip(center, cell_lo, cell_lo + self.cell_size)
+        coords = coords[((nearest - center) ** 2).sum(axis=1) <= chord ** 2]
+
+        keys = self._keys(coords)
+        starts = np.searchsorted(self.sorted_keys, keys, side="left")
+        stops = np.searchsorted(self.sorted_keys, keys, side="right")
+        counts = stops - starts
+        if counts.sum() == 0:
+            return np.zeros(0, dtype=np.int64)
+        # Concatenate the ranges [start, stop) without a Python loop
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return offsets + np.arange(counts.sum())
+
+    def cone_search(self, ra_deg, dec_deg, radius_deg):
+        """Indices of all points within radius_deg of (ra_deg, dec_deg), sorted by distance."""
+        center = radec_to_unit(ra_deg, dec_deg)
+        theta = np.radians(radius_deg)
+        chord = 2.0 * np.sin(min(theta, np.pi) / 2.0)
+        cand = self._candidates(center, chord)
+        cosines = self.sorted_xyz[cand] @ center
+        keep = cosines >= np.cos(theta)
+        cand, cosines = cand[keep], cosines[keep]
+        by_distance = np.argsort(-cosines, kind="stable")
+        return self.order[cand[by_distance]]
+
+    def nearest(self, ra_deg, dec_deg, k=1):
+        """
+        The k nearest points to (ra_deg, dec_deg).
+        Returns (indices, separations in degrees), nearest first.
+        """
+        k = min(k, len(self))
+        center = radec_to_unit(ra_deg, dec_deg)
+        chord = self.cell_size
+        while True:
+            cand = self._candidates(center, chord)
+            if len(cand) >= k or chord >= 2.0:
+                d2 = ((self.sorted_xyz[cand] - center) ** 2).sum(axis=1)
+                best = np.argsort(d2, kind="stable")[:k]
+                # Only trust the answer if the k-th point lies inside the searched sphere
+                if len(best) == k and (chord >= 2.0 or d2[best[-1]] <= chord ** 2):
+                    sep = np.degrees(2.0 * np.arcsin(np.minimum(np.sqrt(d2[best]) / 2.0, 1.0)))
+                    return self.order[cand[best]], sep
+            chord = min(2.0 * chord, 2.0)
+
+
+# -------------------------
+# CATALOG
+# -------------------------
+class GalaxyCatalog:
+    """
+    Names plus float64 RA/Dec (degrees), unit vectors and a lazily built SkyIndex.
+    ra_text / dec_text optionally keep the coordinates as written in the source.
+    """
+
+    def __init__(self, names, ra_deg, dec_deg, ra_text=None, dec_text=None):
+        self.names = np.asarray(names, dtype=str)
+        self.ra = np.asarray(ra_deg, dtype=float)
+        self.dec = np.asarray(dec_deg, dtype=float)
+        self.ra_text, self.dec_text = ra_text, dec_text
+        self.xyz = radec_to_unit(self.ra, self.dec)
+        self._index = None
+
+    def __len__(self):
+        return len(self.ra)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = SkyIndex(self.xyz)
+        return self._index
+
+    def cone_search(self, ra_deg, dec_deg, radius_deg):
+        return self.index.cone_search(ra_deg, dec_deg, radius_deg)
+
+    def nearest(self, ra_deg, dec_deg, k=1):
+        return self.index.nearest(ra_deg, dec_deg, k)
+
+
+def load_galaxies(path=GALAXIES_CSV):
+    """Read a Name,RA(2000),DEC(2000) CSV (like perspective/galaxies.csv) into a GalaxyCatalog."""
+    rows = np.char.strip(np.loadtxt(path, dtype=str, delimiter=",", skiprows=1, ndmin=2, encoding="utf-8"))
+    return GalaxyCatalog(rows[:, 0], parse_ra(rows[:, 1]), parse_dec(rows[:, 2]),
+                         ra_text=rows[:, 1], dec_text=rows[:, 2])
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from star_raster import create_star_grid
+
+# Above this size the per-cell grid lines cost more to draw than the image
+MAX_GRID_LINES_DIM = 64
+
+
+class FrameRateMeter:
+    """Measures the achieved frame rate as a smoothed (exponential moving) average."""
+
+    def __init__(self, smoothing=0.9):
+        self.smoothing = smoothing
+        self.fps = 0.0
+        self.frames = 0
+        self._start = None
+        self._last = None
+
+    def tick(self):
+        """Call once per displayed frame; returns the current smoothed fps."""
+        now = time.perf_counter()
+        if self._last is None:
+            self._start = now
+        else:
+            instant = 1.0 / max(now - self._last, 1e-9)
+            self.fps = instant if self.frames == 1 else (
+                self.smoothing * self.fps + (1.0 - self.smoothing) * instant)
+        self._last = now
+        self.frames += 1
+        return self.fps
+
+    def average(self):
+        """Mean fps since the first tick."""
+        if self.frames < 2:
+            return 0.0
+        return (self.frames - 1) / (self._last - self._start)
+
+
+class StarGridView:
+    """
+    Side-by-side star grids whose artists are created once.
+
+    imshow, the cell grid, ticks and titles are set up in __init__; update()
+    only refills the grids in place and calls set_data on the existing images,
+    so each tick costs one canvas draw and nothing else.
+    """
+
+    def __init__(self, axes, titles, dim=10, fill_value=0.0, vmin=0.0, vmax=1.0):
+        self.dim = dim
+        self.fill_value = fill_value
+        # float32 grids and data-stage nearest resampling keep large grids cheap to draw
+        self.grids = [create_star_grid(dim, fill_value=fill_value, out=np.empty((dim, dim), np.float32))
+                      for _ in axes]
+        self.images = []
+        for ax, grid, title in zip(axes, self.grids, titles):
+            image = ax.imshow(grid, cmap='gray', vmin=vmin, vmax=vmax,
+                              interpolation='nearest', interpolation_stage='data')
+            if dim <= MAX_GRID_LINES_DIM:
+                ax.set_xticks(np.arange(-0.5, dim, 1), minor=True)
+                ax.set_yticks(np.arange(-0.5, dim, 1), minor=True)
+                ax.grid(which="minor", color='gray', linestyle='-', linewidth=1)
+            ax.tick_params(which="both", bottom=False, left=False, labelbottom=False, labelleft=False)
+            ax.set_title(title)
+            self.images.append(image)
+
+    def update(self, brightnesses, clim=None):
+        """Set the star brightness of each grid; optionally change the colour limits."""
+        for image, grid, brightness in zip(self.images, self.grids, brightnesses):
+            create_star_grid(self.dim, fill_value=self.fill_value,
+                             transit_value=brightness, out=grid)
+            image.set_data(grid)
+            if clim is not None:
+                image.set_clim(*clim)
+        return self.images
+
+
+def run_star_grids(titles, suptitle, next_brightnesses, dim=10, interval=1 / 60, status=None):
+    """
+    Persistent-artist loop shared by the brightness simulations.
+
+    next_brightnesses() is called once per tick and returns one brightness per
+    grid. The achieved frame rate is shown in the figure and printed on exit.
+    If given, status(brightnesses) returns a line of text shown under the grids.
+    """
+    fig, axes = plt.subplots(1, len(titles), figsize=(10, 5))
+    view = StarGridView(axes, titles, dim=dim)
+    fig.suptitle(suptitle)
+    fps_text = fig.text(0.99, 0.01, "", ha="right", va="bottom", fontsize=9, color="gray")
+    status_text = fig.text(0.5, 0.04, "", ha="center", va="bottom", fontsize=10)
+    meter = FrameRateMeter()
+    plt.ion()  # Turn on interactive mode
+
+    try:
+        while plt.fignum_exists(fig.number):  # Check if figure is still open
+            brightnesses = next_brightnesses()
+            view.update(brightnesses)
+            if status is not None:
+                status_text.set_text(status(brightnesses))
+            fps_text.set_text(f"{meter.tick():.1f} fps")
+            plt.pause(interval)
+    except KeyboardInterrupt:
+        pass  # Allow clean exit when user interrupts execution
+    finally:
+        plt.ioff()  # Turn off interactive mode
+        plt.close(fig)
+        print(f"Achieved {meter.average():.1f} fps over {meter.frames} frames")
+    return meter
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def circle_overlap_area(d, r1, r2):
+    """
+    Exact intersection area of two circles with radii r1, r2 whose centers are d apart.
+    All arguments broadcast against each other; the result is a float64 array.
+    """
+    d, r1, r2 = np.broadcast_arrays(np.asarray(d, dtype=float),
+                                    np.asarray(r1, dtype=float),
+                                    np.asarray(r2, dtype=float))
+    area = np.zeros(d.shape)
+
+    # One circle entirely inside the other: the smaller disk is covered
+    inside = d <= np.abs(r1 - r2)
+    area[inside] = np.pi * np.minimum(r1[inside], r2[inside]) ** 2
+
+    # Partial overlap: only evaluate the lens formula where it is needed,
+    # so long time series that are mostly out of transit stay cheap
+    partial = ~inside & (d < r1 + r2)
+    d, r1, r2 = d[partial], r1[partial], r2[partial]
+    cos1 = np.clip((d**2 + r1**2 - r2**2) / (2.0 * d * r1), -1.0, 1.0)
+    cos2 = np.clip((d**2 + r2**2 - r1**2) / (2.0 * d * r2), -1.0, 1.0)
+    kite = (-d + r1 + r2) * (d + r1 - r2) * (d - r1 + r2) * (d + r1 + r2)
+    area[partial] = (r1**2 * np.arccos(cos1) + r2**2 * np.arccos(cos2)
+                     - 0.5 * np.sqrt(np.maximum(kite, 0.0)))
+    return area
+
+
+def transit_flux(planet_x, r_planet, impact=0.0, r_star=1.0, in_front=True):
+    """
+    Normalized flux of a uniform stellar disk for a whole time series at once.
+
+    planet_x  : planet position along the transit chord (star at the origin)
+    r_planet  : planet radius
+    impact    : planet position perpendicular to the chord (impact parameter)
+    r_star    : star radius
+    in_front  : boolean mask; the planet only blocks light where it is True
+
+    Every argument may be a scalar or an array and they broadcast together,
+    so a curve with millions of samples is a single call.
+    """
+    separation = np.hypot(planet_x, impact)
+    blocked = circle_overlap_area(separation, r_star, r_planet)
+    flux = 1.0 - blocked / (np.pi * np.asarray(r_star, dtype=float) ** 2)
+    return np.where(in_front, flux, 1.0)
@@ -0,0 +1,235 @@
+"""
+Quadratic limb-darkened transit model.
+
+The star's surface brightness follows the quadratic law
+
+    I(mu) = 1 - u1 (1 - mu) - u2 (1 - mu)^2,    mu = sqrt(1 - r^2)
+
+which is a combination of three basis profiles, 1, mu and mu^2 = 1 - r^2.
+The light a planet blocks is therefore (exact overlap area) x (mean of each
+basis profile over the overlap), combined with coefficients that depend only
+on u1 and u2.
+
+Two evaluation paths:
+
+    limb_darkened_flux_direct  numerical integration over the disk for every
+                               sample (reference, slow)
+    limb_darkened_flux         the mean basis profiles are tabulated once on a
+                               (separation / (1 + k), k) grid; for each (u1, u2)
+                               they are folded into one combined table (kept in
+                               an LRU cache), so a call is an exact overlap area
+                               plus one bilinear lookup
+
+accuracy_report() compares the two and times them.
+
+Example:
+    python limb_darkening.py --u1 0.4 --u2 0.26
+"""
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from light_curve import circle_overlap_area
+
+# Table extent and resolution
+K_MAX = 0.5
+N_Z = 513
+N_K = 129
+
+
+def quadratic_intensity(mu, u1, u2):
+    """Quadratic-law surface brightness, normalized to 1 at disk center."""
+    return 1.0 - u1 * (1.0 - mu) - u2 * (1.0 - mu) ** 2
+
+
+def _basis_coefficients(u1, u2):
+    """
+    Coefficients of I = c0 + c1 mu + c2 (1 - r^2) and the total stellar flux
+    pi (1 - u1 / 3 - u2 / 6).
+    """
+    c = np.array([1.0 - u1 - u2, u1 + 2.0 * u2, -u2])
+    total = np.pi * (1.0 - u1 / 3.0 - u2 / 6.0)
+    return c, total
+
+
+@lru_cache(maxsize=8)
+def _nodes(n_nodes):
+    """
+    Gauss-Legendre nodes mapped through x = (1 - cos(theta)) / 2 on [0, 1].
+    The substitution removes the square-root behaviour at both ends of each
+    radial interval (disk edges and contact points).
+    """
+    theta, w = np.polynomial.legendre.leggauss(n_nodes)
+    theta = (theta + 1.0) * np.pi / 2.0
+    return (1.0 - np.cos(theta)) / 2.0, w * np.sin(theta) * np.pi / 4.0
+
+
+def _segment(lo, hi, n_nodes):
+    x, w = _nodes(n_nodes)
+    length = np.maximum(hi - lo, 0.0)[:, None]
+    return lo[:, None] + length * x, length * w
+
+
+def _overlap_moments(d, k, n_nodes):
+    """
+    Integrals of 1, mu and 1 - r^2 over the overlap of the unit stellar disk
+    and a planet disk of radius k at separation d (1-D arrays). Returns (3, n).
+
+    The overlap is integrated in rings around the star's center: rings with
+    r < k - d lie entirely inside the planet (length 2 pi r); further out the
+    planet covers an arc of each ring.
+    """
+    d = np.maximum(d, 1e-12)
+
+    # Rings entirely covered by the planet
+    r, w = _segment(np.zeros_like(d), np.clip(k - d, 0.0, 1.0), n_nodes)
+    ring = 2.0 * np.pi * r * w
+
+    # Rings partially covered by the planet
+    r2, w2 = _segment(np.clip(np.abs(d - k), 0.0, 1.0), np.minimum(d + k, 1.0), n_nodes)
+    cos_phi = np.clip((r2 ** 2 + d[:, None] ** 2 - k[:, None] ** 2)
+                      / np.maximum(2.0 * r2 * d[:, None], 1e-300), -1.0, 1.0)
+    arc = 2.0 * r2 * np.arccos(cos_phi) * w2
+
+    r, ring = np.concatenate([r, r2], axis=1), np.concatenate([ring, arc], axis=1)
+    one_minus_r2 = np.maximum(1.0 - r ** 2, 0.0)
+    return np.stack([ring.sum(axis=1),
+                     (ring * np.sqrt(one_minus_r2)).sum(axis=1),
+                     (ring * one_minus_r2).sum(axis=1)])
+
+
+def limb_darkened_flux_direct(separation, radius_ratio, u1, u2, n_nodes=64, chunk_size=8192):
+    """
+    Normalized flux of a quadratically limb-darkened star by direct radial
+    integration over the occulted area. separation is the planet-star
+    distance and radius_ratio the planet radius, both in stellar radii.
+    Inputs broadcast; the work is done chunk_size samples at a time.
+    """
+    d, k = np.broadcast_arrays(np.asarray(separation, dtype=float),
+                               np.asarray(radius_ratio, dtype=float))
+    c, total = _basis_coefficients(u1, u2)
+    d_flat, k_flat = d.ravel(), k.ravel()
+    blocked = np.empty(d.size)
+    for start in range(0, d.size, chunk_size):
+        stop = start + chunk_size
+        blocked[start:stop] = c @ _overlap_moments(d_flat[start:stop], k_flat[start:stop], n_nodes)
+    return 1.0 - blocked.reshape(d.shape) / total
+
+
+@lru_cache(maxsize=4)
+def basis_tables(n_z=N_Z, n_k=N_K, k_max=K_MAX, n_nodes=128):
+    """
+    Mean of mu and of 1 - r^2 over the occulted area, on a grid of
+    z = separation / (1 + k) in [0, 1] and k in [0, k_max].
+    Returns (z_grid, k_grid, tables) with tables of shape (2, n_z, n_k).
+    Computed once per grid and cached; the first call takes under a second.
+    """
+    z_grid = np.linspace(0.0, 1.0, n_z)
+    k_grid = np.linspace(0.0, k_max, n_k)
+    z, k = np.meshgrid(z_grid, k_grid, indexing="ij")
+    # A vanishing planet samples the profile at a point; keep k > 0 and
+    # stop just short of last contact so every cell has a finite overlap
+    k = np.maximum(k, 1e-4)
+    d = np.minimum(z * (1.0 + k), 1.0 + k - 1e-9)
+
+    moments = np.concatenate([_overlap_moments(d_part, k_part, n_nodes)
+                              for d_part, k_part in zip(np.array_split(d.ravel(), 16),
+                                                        np.array_split(k.ravel(), 16))], axis=1)
+    tables = (moments[1:] / np.maximum(moments[0], 1e-300)).reshape(2, n_z, n_k)
+    for table in tables:
+        table.flags.writeable = False
+    return z_grid, k_grid, tables
+
+
+@lru_cache(maxsize=64)
+def coefficient_table(u1, u2, n_z=N_Z, n_k=N_K, k_max=K_MAX):
+    """
+    Combined (n_z, n_k) table of mean intensity over the occulted area,
+    divided by the total stellar flux, for one pair of coefficients.
+    Cached on (u1, u2), so a fit that revisits coefficients pays nothing.
+    """
+    _, _, tables = basis_tables(n_z, n_k, k_max)
+    c, total = _basis_coefficients(u1, u2)
+    table = (c[0] + c[1] * tables[0] + c[2] * tables[1]) / total
+    table.flags.writeable = False
+    return table
+
+
+def limb_darkened_flux(separation, radius_ratio, u1, u2, n_z=N_Z, n_k=N_K, k_max=K_MAX):
+    """
+    Normalized flux of a quadratically limb-darkened star (table path).
+
+    separation and radius_ratio are in stellar radii and broadcast together;
+    radius_ratio must not exceed k_max. With the default table the flux error
+    is below 1e-6 rms and about 2e-5 at worst, near the limb (see accuracy_report).
+    """
+    d, k = np.broadcast_arrays(np.asarray(separation, dtype=float),
+                               np.asarray(radius_ratio, dtype=float))
+    if np.any(k > k_max):
+        raise ValueError(f"radius_ratio above the table limit k_max={k_max}; "
+                         "use limb_darkened_flux_direct or a larger table")
+    table = coefficient_table(float(u1), float(u2), n_z, n_k, k_max)
+
+    # Fractional table indices, then a bilinear blend of the four neighbours
+    zi = np.clip(d / (1.0 + k), 0.0, 1.0) * (n_z - 1)
+    ki = k * ((n_k - 1) / k_max)
+    z0 = np.minimum(zi.astype(np.intp), n_z - 2)
+    k0 = np.minimum(ki.astype(np.intp), n_k - 2)
+    fz, fk = zi - z0, ki - k0
+    mean_intensity = ((1.0 - fz) * ((1.0 - fk) * table[z0, k0] + fk * table[z0, k0 + 1])
+                      + fz * ((1.0 - fk) * table[z0 + 1, k0] + fk * table[z0 + 1, k0 + 1]))
+
+    return 1.0 - circle_overlap_area(d, 1.0, k) * mean_intensity
+
+
+def accuracy_report(u1=0.4, u2=0.26, n_samples=200_000, k_max=0.3, seed=0, n_nodes=256):
+    """
+    Compare the table path against direct integration on random (separation,
+    radius_ratio) samples in and around transit, and time both paths.
+    Returns a dict with the maximum and RMS flux error and the speed-up.
+    """
+    rng = np.random.default_rng(seed)
+    k = rng.uniform(0.0, k_max, n_samples)
+    d = rng.uniform(0.0, 1.0 + k)
+
+    coefficient_table(float(u1), float(u2))  # build the tables outside the timing
+    start = time.perf_counter()
+    table = limb_darkened_flux(d, k, u1, u2)
+    table_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    direct = limb_darkened_flux_direct(d, k, u1, u2)
+    direct_time = time.perf_counter() - start
+
+    reference = limb_darkened_flux_direct(d, k, u1, u2, n_nodes=n_nodes)
+    table_error = table - reference
+    return {
+        "samples": n_samples,
+        "max_error": float(np.abs(table_error).max()),
+        "rms_error": float(np.sqrt(np.mean(table_error ** 2))),
+        "direct_max_error": float(np.abs(direct - reference).max()),
+        "table_seconds": table_time,
+        "direct_seconds": direct_time,
+        "speedup": direct_time / table_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy and speed of the tabulated limb-darkening model.")
+    parser.add_argument("--u1", type=float, default=0.4)
+    parser.add_argument("--u2", type=float, default=0.26)
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    report = accuracy_report(args.u1, args.u2, args.samples)
+    print(f"{report['samples']} samples, u1={args.u1}, u2={args.u2}")
+    print(f"  table vs reference : max {report['max_error']:.2e}, rms {report['rms_error']:.2e}")
+    print(f"  direct vs reference: max {report['direct_max_error']:.2e}")
+    print(f"  table {report['table_seconds'] * 1e3:.1f} ms, direct {report['direct_seconds'] * 1e3:.1f} ms "
+          f"({report['speedup']:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
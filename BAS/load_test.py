@@ -0,0 +1,121 @@
+"""
+Load test for perspective_server.py.
+
+Opens `concurrency` keep-alive connections and has each one send requests
+back to back (cycling through the paths given), then reports throughput and
+latency percentiles per path and overall.
+
+Example:
+    python load_test.py --port 8000 --concurrency 64 --seconds 10
+    python load_test.py --spawn --path /api/galaxies/random --path "/api/starfield?seed=1"
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+DEFAULT_PATHS = [
+    "/",
+    "/api/galaxies/random",
+    "/api/galaxies?offset=0&limit=50",
+    "/api/galaxies/cone?ra=150&dec=20&radius=15",
+    "/api/starfield?n=4000&seed=0",
+]
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        if line[:15].lower() == b"content-length:":
+            length = int(line[15:])
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _worker(host, port, paths, offset, deadline, gzip, latencies, counts, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    extra = "Accept-Encoding: gzip\r\n" if gzip else ""
+    requests = [f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n".encode("latin-1")
+                for path in paths]
+    clock = time.perf_counter
+    i = offset
+    try:
+        while clock() < deadline:
+            k = i % len(paths)
+            start = clock()
+            writer.write(requests[k])
+            status = await _read_response(reader)
+            latencies[k].append(clock() - start)
+            if status >= 400:
+                errors[k] += 1
+            counts[k] += 1
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, paths, concurrency=32, seconds=5.0, gzip=True):
+    latencies = [[] for _ in paths]
+    counts = [0] * len(paths)
+    errors = [0] * len(paths)
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(_worker(host, port, paths, c, deadline, gzip, latencies, counts, errors)
+                           for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "paths": paths, "counts": counts, "errors": errors,
+            "latencies": [np.array(values) for values in latencies]}
+
+
+def summarize(result):
+    lines = []
+    everything = np.concatenate(result["latencies"]) * 1e3
+    total = int(sum(result["counts"]))
+    lines.append(f"{total} requests in {result['elapsed']:.1f} s = {total / result['elapsed']:.0f} req/s, "
+                 f"{sum(result['errors'])} errors")
+    rows = [("all", everything)] + [(path, values * 1e3)
+                                    for path, values in zip(result["paths"], result["latencies"])]
+    for name, values in rows:
+        if len(values):
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            lines.append(f"  {name:48s} n={len(values):7d}  p50 {p50:6.2f}  p95 {p95:6.2f}  "
+                         f"p99 {p99:6.2f}  max {values.max():7.2f} ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency percentiles for perspective_server.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--path", action="append", help="path to request (repeatable)")
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--spawn", action="store_true", help="start the server in a subprocess first")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perspective_server.py")
+        server = subprocess.Popen([sys.executable, script, "--host", args.host, "--port", str(args.port)],
+                                  stdout=subprocess.PIPE)
+        server.stdout.readline()  # wait until it is listening
+    try:
+        result = asyncio.run(run_load(args.host, args.port, args.path or DEFAULT_PATHS,
+                                      args.concurrency, args.seconds, not args.no_gzip))
+        print(summarize(result))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Vectorized Keplerian orbits.
+
+Every function works on whole arrays at once: orbital elements broadcast
+against each other (e.g. shape (n_systems, n_planets)), and the time samples
+are added as a trailing axis, so results have shape elements.shape + t.shape.
+
+Sky-plane convention: X and Y lie in the plane of the sky (the plane of the
+demo figures) and Z points toward the observer, so a planet with Z > 0 is in
+front of its star. inc = 0 is a face-on orbit, inc = pi/2 is edge-on.
+"""
+import numpy as np
+
+
+def solve_kepler(mean_anomaly, eccentricity, tol=1e-12, max_iter=50):
+    """
+    Solve Kepler's equation E - e sin(E) = M for the eccentric anomaly E.
+
+    Newton's method runs on the whole array at once; after each step the
+    samples that have converged (|dE| < tol) drop out, so the remaining
+    iterations only touch the hard cases (high e near periastron).
+    Raises RuntimeError if some samples have not converged after max_iter steps.
+    """
+    shape = np.broadcast(mean_anomaly, eccentricity).shape
+    M = np.broadcast_to(np.mod(mean_anomaly, 2.0 * np.pi), shape).ravel()
+    e = np.broadcast_to(np.asarray(eccentricity, dtype=float), shape).ravel()
+    if np.any((e < 0) | (e >= 1)):
+        raise ValueError("eccentricity must be in [0, 1)")
+
+    # Starting at E = pi for very eccentric orbits avoids Newton overshooting
+    E = np.where(e > 0.8, np.pi, M)
+    active = np.arange(M.size)
+    for _ in range(max_iter):
+        Ea, ea = E[active], e[active]
+        step = (Ea - ea * np.sin(Ea) - M[active]) / (1.0 - ea * np.cos(Ea))
+        E[active] = Ea - step
+        active = active[np.abs(step) >= tol]
+        if active.size == 0:
+            break
+    else:
+        raise RuntimeError(f"Kepler solver did not converge for {active.size} samples")
+
+    return E.reshape(shape)
+
+
+def orbit_positions(t, period, a, e=0.0, inc=0.0, omega=0.0, Omega=0.0, t_peri=0.0,
+                    tol=1e-12, max_iter=50):
+    """
+    Sky-projected positions of planets relative to their star.
+
+    t      : 1-D array of time samples
+    period : orbital period (same units as t)
+    a      : semi-major axis of the relative orbit
+    e      : eccentricity
+    inc    : inclination in radians (0 = face-on)
+    omega  : argument of periastron in radians
+    Omega  : longitude of the ascending node in radians (rotation in the sky plane)
+    t_peri : time of periastron passage
+
+    Returns an array of shape (3,) + elements.shape + t.shape holding X, Y, Z.
+    """
+    t = np.asarray(t, dtype=float)
+    period, a, e, inc, omega, Omega, t_peri = (
+        np.asarray(p, dtype=float)[..., None]
+        for p in np.broadcast_arrays(period, a, e, inc, omega, Omega, t_peri))
+
+    M = 2.0 * np.pi * (t - t_peri) / period
+    E = solve_kepler(M, e, tol=tol, max_iter=max_iter)
+
+    # True anomaly and separation
+    f = 2.0 * np.arctan2(np.sqrt(1.0 + e) * np.sin(E / 2.0),
+                         np.sqrt(1.0 - e) * np.cos(E / 2.0))
+    r = a * (1.0 - e * np.cos(E))
+
+    # Rotate from the orbital plane to the sky
+    u = omega + f
+    cos_u, sin_u = np.cos(u), np.sin(u)
+    cos_O, sin_O = np.cos(Omega), np.sin(Omega)
+    cos_i = np.cos(inc)
+    positions = np.empty((3,) + M.shape)
+    positions[0] = r * (cos_O * cos_u - sin_O * sin_u * cos_i)
+    positions[1] = r * (sin_O * cos_u + cos_O * sin_u * cos_i)
+    positions[2] = r * sin_u * np.sin(inc)
+    return positions
+
+
+def star_offsets(positions, star_mass, planet_mass, planet_axis=-2):
+    """
+    Barycentric offset of the star from the planets' relative positions.
+
+    positions   : output of orbit_positions, shape (3, ..., n_planets, n_times)
+    star_mass   : star masses, shape (...) (the elements without the planet axis)
+    planet_mass : planet masses, shape (..., n_planets)
+    planet_axis : negative index of the planet axis in `positions`
+
+    Each planet pulls the star by -m_p / (M_star + sum(m_p)) times its relative
+    position; the contributions are summed over the planet axis, so even a
+    single planet needs an axis of length 1. Returns shape (3, ..., n_times).
+    """
+    if planet_axis >= 0:
+        raise ValueError("planet_axis must be a negative index")
+    planet_mass = np.asarray(planet_mass, dtype=float)[..., None]
+    total_mass = (np.asarray(star_mass, dtype=float)[..., None]
+                  + planet_mass.sum(axis=planet_axis))
+    return -(positions * planet_mass).sum(axis=planet_axis) / total_mass
@@ -0,0 +1,358 @@
+"""
+Local asyncio HTTP server for the perspective page.
+
+Serves perspective/index.html and galaxies.csv, plus a small JSON API over an
+in-memory galaxy_catalog.GalaxyCatalog and binary star fields from star_field:
+
+    GET /                                   the page
+    GET /galaxies.csv                       the catalog as the page loads it
+    GET /api/galaxies?offset=0&limit=50     a page of rows, plus the total
+    GET /api/galaxies/random                one random galaxy
+    GET /api/galaxies/cone?ra=&dec=&radius=&limit=
+                                            galaxies within radius degrees,
+                                            nearest first
+    GET /api/starfield?n=4000&width=1920&height=1080&seed=0
+                                            a star field as a binary payload
+
+Star-field payload (little-endian): b"BSF1", then n, width and height as
+uint32, then the x, y and size columns as float32[n] and color as uint8[n]
+(0 = white, 1 = red), as generated by star_field.generate_star_field.
+
+Static files, catalog pages, cone results and star fields are cached as
+encoded bytes together with their ETag and a gzip copy, in an LRU bounded by
+bytes. Requests with a matching If-None-Match get a 304, and clients that
+accept gzip get the compressed copy. Star fields are generated and compressed
+in a worker thread, so a large one does not stall the other connections.
+Connections are kept alive (HTTP/1.1), and uvloop is used when it is
+installed.
+
+Example:
+    python perspective_server.py --port 8000
+    python load_test.py --port 8000 --concurrency 64 --seconds 10
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import struct
+import traceback
+from pathlib import Path
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from galaxy_catalog import GALAXIES_CSV, load_galaxies
+from star_field import STAR_COUNT, generate_star_field
+
+PERSPECTIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perspective")
+STARFIELD_MAGIC = b"BSF1"
+MAX_STARS = 2_000_000
+MAX_PAGE = 1000
+MAX_BODY = 64 * 2**10  # request bodies are read and discarded; larger ones are refused
+CACHE_BYTES = 256 * 2**20
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Content Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """Encoded body with its ETag and (for larger bodies) a gzip copy, built once and reused."""
+
+    def __init__(self, body, content_type, cacheable=True):
+        self.body = body
+        self.content_type = content_type
+        self.cacheable = cacheable
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"' if cacheable else None
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) > 512 else None
+        if self.gzipped is not None and len(self.gzipped) >= len(body):
+            self.gzipped = None
+
+    @property
+    def nbytes(self):
+        return len(self.body) + (len(self.gzipped) if self.gzipped is not None else 0)
+
+
+def json_response(value, cacheable=True):
+    return Response(json.dumps(value, separators=(",", ":")).encode("utf-8"),
+                    "application/json", cacheable)
+
+
+class LRUCache:
+    """Responses bounded by max_bytes of encoded bodies (plain plus gzip copy)."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.nbytes = 0
+
+    def peek(self, key):
+        response = self.items.get(key)
+        if response is not None:
+            self.items.move_to_end(key)
+        return response
+
+    def put(self, key, response):
+        if response.nbytes > self.max_bytes:
+            return response  # served, but too big to keep
+        if key in self.items:
+            self.nbytes -= self.items.pop(key).nbytes
+        while self.items and self.nbytes + response.nbytes > self.max_bytes:
+            _, evicted = self.items.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        self.items[key] = response
+        self.nbytes += response.nbytes
+        return response
+
+    def get(self, key, build):
+        response = self.peek(key)
+        return self.put(key, build()) if response is None else response
+
+
+# -------------------------
+# APPLICATION
+# -------------------------
+class PerspectiveApp:
+    """
+    Routes requests to cached responses. Catalog routes are answered on the
+    event loop (they are fast); star fields are built in a worker thread.
+    """
+
+    def __init__(self, csv_path=GALAXIES_CSV, seed=None, cache_bytes=CACHE_BYTES):
+        self.catalog = load_galaxies(csv_path)
+        self.catalog.index  # build the cone-search index up front
+        self.ra_text, self.dec_text = self.catalog.ra_text.tolist(), self.catalog.dec_text.tolist()
+        self.names = self.catalog.names.tolist()
+        self.rng = np.random.default_rng(seed)
+
+        self.static = {
+            "/": self._file_response("index.html", "text/html; charset=utf-8"),
+            "/galaxies.csv": Response(Path(csv_path).read_bytes(), "text/csv; charset=utf-8"),
+        }
+        self.static["/index.html"] = self.static["/"]
+        self.cache = LRUCache(cache_bytes)
+        self._building = {}  # star-field key -> future of the build in progress
+        key = ("starfield", STAR_COUNT, 1920, 1080, 0)
+        self.cache.put(key, _starfield_response(*key[1:]))  # pre-generate the default field
+
+    def _file_response(self, name, content_type):
+        return Response(Path(PERSPECTIVE_DIR, name).read_bytes(), content_type)
+
+    def galaxy(self, i):
+        return {"id": int(i), "name": self.names[i], "ra": self.ra_text[i], "dec": self.dec_text[i],
+                "ra_deg": float(self.catalog.ra[i]), "dec_deg": float(self.catalog.dec[i])}
+
+    async def handle(self, path, query):
+        if path in self.static:
+            return self.static[path]
+        if path == "/api/galaxies/random":
+            return json_response(self.galaxy(self.rng.integers(len(self.catalog))), cacheable=False)
+        if path == "/api/galaxies":
+            offset = _int_param(query, "offset", 0, 0, len(self.catalog))
+            limit = _int_param(query, "limit", 50, 1, MAX_PAGE)
+            return self.cache.get(("page", offset, limit), lambda: json_response({
+                "total": len(self.catalog), "offset": offset,
+                "items": [self.galaxy(i) for i in range(offset, min(offset + limit, len(self.catalog)))]}))
+        if path == "/api/galaxies/cone":
+            ra = _float_param(query, "ra", None, 0.0, 360.0)
+            dec = _float_param(query, "dec", None, -90.0, 90.0)
+            radius = _float_param(query, "radius", 10.0, 0.0, 180.0)
+            limit = _int_param(query, "limit", 100, 1, MAX_PAGE)
+            return self.cache.get(("cone", ra, dec, radius, limit),
+                                  lambda: self.cone(ra, dec, radius, limit))
+        if path == "/api/starfield":
+            n = _int_param(query, "n", STAR_COUNT, 1, MAX_STARS)
+            width = _int_param(query, "width", 1920, 1, 16384)
+            height = _int_param(query, "height", 1080, 1, 16384)
+            seed = _int_param(query, "seed", 0, 0, 2**32 - 1)
+            return await self.starfield(n, width, height, seed)
+        raise HTTPError(404, f"no route for {path}")
+
+    def cone(self, ra, dec, radius, limit):
+        found = self.catalog.cone_search(ra, dec, radius)
+        return json_response({"count": int(len(found)),
+                              "items": [self.galaxy(i) for i in found[:limit]]})
+
+    async def starfield(self, n, width, height, seed):
+        """Cached star field, or one built (and gzipped) in a worker thread; concurrent requests share it."""
+        key = ("starfield", n, width, height, seed)
+        response = self.cache.peek(key)
+        if response is not None:
+            return response
+        future = self._building.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._building[key] = loop.run_in_executor(None, _starfield_response, n, width, height, seed)
+            future.add_done_callback(lambda _: self._building.pop(key, None))
+        return self.cache.put(key, await future)
+
+
+def _starfield_response(n, width, height, seed):
+    field = generate_star_field(n, width, height, rng=seed)
+    body = b"".join([STARFIELD_MAGIC, struct.pack("<III", n, width, height),
+                     field["x"].astype("<f4").tobytes(), field["y"].astype("<f4").tobytes(),
+                     field["size"].astype("<f4").tobytes(), field["color"].tobytes()])
+    return Response(body, "application/octet-stream")
+
+
+def _param(query, name, default):
+    values = query.get(name)
+    if not values:
+        if default is None:
+            raise HTTPError(400, f"missing parameter {name!r}")
+        return default
+    return values[0]
+
+
+def _int_param(query, name, default, low, high):
+    try:
+        value = int(_param(query, name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+    if not low <= value <= high:
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return value
+
+
+def _float_param(query, name, default, low, high):
+    try:
+        value = float(_param(query, name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} must be a number") from None
+    if not low <= value <= high:
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return value
+
+
+# -------------------------
+# HTTP/1.1 SERVER
+# -------------------------
+def _head(status, content_type, length, etag=None, encoding=None, keep_alive=True, cacheable=True):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+             f"Content-Length: {length}",
+             "Connection: keep-alive" if keep_alive else "Connection: close"]
+    if content_type:
+        lines.append(f"Content-Type: {content_type}")
+    if etag:
+        lines.append(f"ETag: {etag}")
+    lines.append("Cache-Control: no-cache" if cacheable else "Cache-Control: no-store")
+    if encoding:
+        lines.append(f"Content-Encoding: {encoding}")
+    lines.append("Vary: Accept-Encoding")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _error(status, message, keep_alive):
+    body = json.dumps({"error": message}).encode("utf-8")
+    return _head(status, "application/json", len(body), keep_alive=keep_alive, cacheable=False) + body
+
+
+async def render(app, method, target, headers, keep_alive):
+    """Bytes of the full HTTP response to one request."""
+    if method not in ("GET", "HEAD"):
+        body = b"only GET and HEAD are supported\n"
+        return _head(405, "text/plain", len(body), keep_alive=keep_alive, cacheable=False) + body
+    url = urlsplit(target)
+    try:
+        response = await app.handle(url.path, parse_qs(url.query))
+    except HTTPError as exc:
+        return _error(exc.status, str(exc), keep_alive)
+
+    if response.etag and response.etag in headers.get("if-none-match", ""):
+        return _head(304, None, 0, response.etag, keep_alive=keep_alive)
+    body, encoding = response.body, None
+    if response.gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+        body, encoding = response.gzipped, "gzip"
+    head = _head(200, response.content_type, len(body), response.etag, encoding,
+                 keep_alive, response.cacheable)
+    return head if method == "HEAD" else head + body
+
+
+async def handle_connection(app, reader, writer):
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = raw.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            # Drain any request body; one that cannot be framed ends the connection
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_BODY:
+                status, message = (413, f"request body over {MAX_BODY} bytes") if length > 0 else \
+                    (400, "invalid Content-Length")
+                writer.write(_error(status, message, keep_alive=False))
+                await writer.drain()
+                break
+            await reader.readexactly(length)
+
+            try:
+                writer.write(await render(app, method, target, headers, keep_alive))
+            except Exception:
+                traceback.print_exc()
+                writer.write(_error(500, "internal server error", keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(app, host="127.0.0.1", port=8000, ready=None):
+    server = await asyncio.start_server(lambda r, w: handle_connection(app, r, w), host, port,
+                                        backlog=1024)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def run(host="127.0.0.1", port=8000, seed=None):
+    app = PerspectiveApp(seed=seed)
+    print(f"Serving {PERSPECTIVE_DIR} and {len(app.catalog)} galaxies on http://{host}:{port}/")
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    try:
+        asyncio.run(serve(app, host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the perspective page and its catalog API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=None, help="seed for /api/galaxies/random")
+    args = parser.parse_args()
+    run(args.host, args.port, args.seed)
+
+
+if __name__ == "__main__":
+    main()
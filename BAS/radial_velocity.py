@@ -0,0 +1,100 @@
+"""
+Batch radial-velocity curves for many star + planet systems at once.
+
+This is the star-wobble barycenter model from star-wobble.py, generalised to
+eccentric, inclined, multi-planet systems. Each planet moves the star on a
+reflex orbit with semi-major axis a * m_p / (M_star + m_p); its line-of-sight
+velocity is
+
+    v_r = K * (cos(omega + f) + e * cos(omega))
+    K   = 2 pi a_star sin(inc) / (P sqrt(1 - e^2))
+
+with f the true anomaly from orbits.solve_kepler. Positive v_r is motion away
+from the observer (red-shift). Contributions from all planets are summed.
+"""
+import numpy as np
+
+from orbits import solve_kepler
+
+G = 6.67430e-11          # m^3 kg^-1 s^-2
+M_SUN = 1.98841e30       # kg
+M_JUP = 1.89813e27       # kg
+M_EARTH = 5.97217e24     # kg
+AU = 1.495978707e11      # m
+DAY = 86400.0            # s
+
+
+def _reflex_elements(star_mass, planet_mass, period, separation, mass_unit, length_unit, time_unit):
+    """Fill in whichever of period / separation is missing with Kepler's third law."""
+    if period is None and separation is None:
+        raise ValueError("give a period, a separation, or both")
+    gm = G * (star_mass + planet_mass) * mass_unit  # m^3 s^-2
+    if period is None:
+        a = separation * length_unit
+        period = 2.0 * np.pi * np.sqrt(a**3 / gm) / time_unit
+    elif separation is None:
+        P = period * time_unit
+        separation = np.cbrt(gm * (P / (2.0 * np.pi))**2) / length_unit
+    return period, separation
+
+
+def rv_curves(t, star_mass, planet_mass, period=None, separation=None, e=0.0,
+              inc=np.pi / 2, omega=0.0, t_peri=0.0,
+              mass_unit=M_SUN, length_unit=AU, time_unit=DAY, velocity_unit=1.0,
+              chunk_size=4096):
+    """
+    Stellar radial-velocity time series for a batch of systems.
+
+    t           : 1-D array of n_times sample times
+    star_mass   : shape (n_systems,), or a scalar for all systems
+    planet_mass : shape (n_systems, n_planets); the same shape (or broadcastable
+                  to it) is used for period, separation, e, inc, omega, t_peri.
+                  A scalar or (n_systems,) array means one planet per system,
+                  and a 1-D array with a single star that star's planets.
+    period      : orbital periods; derived from separation if omitted
+    separation  : star-planet semi-major axes; derived from period if omitted
+    inc, omega  : inclination (pi/2 = edge-on) and the star's argument of periastron, radians
+
+    By default masses are in solar masses, separations in AU, times in days and
+    velocities in m/s. Pass length_unit=time_unit=velocity_unit=1 with both a
+    period and a separation to work in arbitrary units (as the demos do).
+
+    Returns an (n_systems, n_times) array. Systems are processed in chunks of
+    chunk_size so the (systems, planets, times) intermediates stay bounded.
+    """
+    t = np.asarray(t, dtype=float)
+    star_mass = np.atleast_1d(np.asarray(star_mass, dtype=float))
+    planet_mass = np.asarray(planet_mass, dtype=float)
+    if planet_mass.ndim == 0 or (planet_mass.ndim == 1 and star_mass.size > 1):
+        # One planet per system
+        star_mass, planet_mass = np.broadcast_arrays(star_mass, planet_mass)
+        planet_mass = planet_mass[:, None]
+    elif planet_mass.ndim == 1:
+        planet_mass = planet_mass[None, :]  # the planets of a single star
+    star_mass = np.broadcast_to(star_mass, planet_mass.shape[:1])
+    shape = planet_mass.shape
+
+    def per_planet(value):
+        return None if value is None else np.broadcast_to(np.asarray(value, dtype=float), shape)
+
+    period, separation, e, inc, omega, t_peri = (
+        per_planet(v) for v in (period, separation, e, inc, omega, t_peri))
+    period, separation = _reflex_elements(star_mass[:, None], planet_mass, period, separation,
+                                          mass_unit, length_unit, time_unit)
+
+    # Semi-amplitude of each planet's reflex motion, converted to velocity_unit
+    a_star = separation * planet_mass / (star_mass[:, None] + planet_mass)
+    K = (2.0 * np.pi * a_star * np.sin(inc) / (period * np.sqrt(1.0 - e**2))
+         * (length_unit / time_unit) / velocity_unit)
+
+    rv = np.empty((shape[0], t.size))
+    for start in range(0, shape[0], chunk_size):
+        s = slice(start, start + chunk_size)
+        M = 2.0 * np.pi * (t - t_peri[s, :, None]) / period[s, :, None]
+        ecc = e[s, :, None]
+        E = solve_kepler(M, ecc)
+        f = 2.0 * np.arctan2(np.sqrt(1.0 + ecc) * np.sin(E / 2.0),
+                             np.sqrt(1.0 - ecc) * np.cos(E / 2.0))
+        w = omega[s, :, None]
+        rv[s] = (K[s, :, None] * (np.cos(w + f) + ecc * np.cos(w))).sum(axis=1)
+    return rv
@@ -0,0 +1,36 @@
+from collections import namedtuple
+
+from matplotlib.animation import FuncAnimation
+
+# Everything needed to drive one of the FuncAnimation demos, either
+# interactively (animate + plt.show) or headless (see frame_export.py).
+#   fig      : the matplotlib Figure
+#   update   : update(frame) -> iterable of changed artists
+#   init     : init() -> iterable of artists, or None
+#   frames   : number of frames in one loop
+#   interval : delay between frames in ms
+Scene = namedtuple("Scene", ["fig", "update", "init", "frames", "interval"])
+
+
+def animate(scene, blit=False, repeat=True, timer=None, cache=None):
+    """
+    Wrap a Scene in a FuncAnimation.
+    Keep a reference to the returned object, or matplotlib will garbage-collect it.
+    Pass a frame_timing.FrameTimer as timer to record per-frame phase timings,
+    and a frame_cache.FrameCache as cache to replay rendered frames on later loops.
+    """
+    if cache is not None:
+        from frame_cache import cached_animation
+        return cached_animation(scene, cache, blit=blit, repeat=repeat, timer=timer)
+    if timer is not None:
+        from frame_timing import timed_animation
+        return timed_animation(scene, timer, blit=blit, repeat=repeat)
+    return FuncAnimation(
+        scene.fig,
+        scene.update,
+        frames=scene.frames,
+        init_func=scene.init,
+        interval=scene.interval,
+        blit=blit,
+        repeat=repeat
+    )
@@ -0,0 +1,292 @@
+"""
+All-sky density maps of large catalogs.
+
+Points given as RA/Dec (degrees) are projected to Mollweide or Aitoff
+coordinates, binned into a (height, width) count raster with np.bincount, and
+shown with a single imshow, so the cost of drawing does not depend on the
+number of points at all. Points are consumed in chunks (arrays, memory maps
+such as catalog_store.BinaryCatalog columns, or generators), so memory stays
+bounded no matter how large the catalog is.
+
+Projections work in place on each chunk. Mollweide's auxiliary angle, which
+normally needs a Newton solve per point, depends only on Dec and is read from
+a table solved once.
+
+Example:
+    python sky_density.py --points 100000000 --output sky.png
+    python sky_density.py --catalog galaxies.cat --projection aitoff
+"""
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# Extent of each projection's native coordinates: |x| <= xmax, |y| <= ymax
+BOUNDS = {
+    "mollweide": (2.0 * np.sqrt(2.0), np.sqrt(2.0)),
+    "aitoff": (np.pi, np.pi / 2.0),
+}
+
+# North galactic pole and the galactic longitude of the north celestial pole (J2000)
+GALACTIC_POLE = (192.85948, 27.12825)
+GALACTIC_L_NCP = 122.93192
+
+
+def _longitude(ra_deg, center_ra):
+    """Longitude relative to center_ra in radians, wrapped to [-pi, pi)."""
+    lam = np.asarray(ra_deg, dtype=float) - (center_ra - 180.0)
+    lam %= 360.0
+    lam -= 180.0
+    lam *= np.pi / 180.0
+    return lam
+
+
+def _mollweide_theta_newton(phi, n_iter=50):
+    """Solve 2 theta + sin(2 theta) = pi sin(phi) by Newton's method on t = 2 theta."""
+    target = np.pi * np.sin(phi)
+    t = 2.0 * phi
+    for _ in range(n_iter):
+        denominator = 1.0 + np.cos(t)
+        t = t - np.where(denominator > 1e-15, (t + np.sin(t) - target) / np.maximum(denominator, 1e-15), 0.0)
+    return np.where(np.abs(phi) >= np.pi / 2.0, phi, t / 2.0)
+
+
+@lru_cache(maxsize=1)
+def _mollweide_tables(n=2**16 + 1):
+    """cos(theta) and sin(theta) of the Mollweide auxiliary angle on a fine Dec grid."""
+    dec = np.linspace(-90.0, 90.0, n)
+    theta = _mollweide_theta_newton(np.radians(dec))
+    return dec, np.cos(theta), np.sin(theta)
+
+
+def mollweide(ra_deg, dec_deg, center_ra=0.0):
+    """
+    Mollweide (x, y) for RA/Dec in degrees, x growing with RA. The auxiliary
+    angle depends on Dec alone, so it is interpolated from a table solved
+    once instead of running Newton's method for every point.
+    """
+    dec, cos_theta, sin_theta = _mollweide_tables()
+    # Linear interpolation on the uniform grid: cell index and fraction
+    position = np.asarray(dec_deg, dtype=float) + 90.0
+    position *= (len(dec) - 1) / 180.0
+    np.clip(position, 0.0, len(dec) - 1.0, out=position)
+    i = np.minimum(position.astype(np.int64), len(dec) - 2)
+    position -= i
+
+    x = cos_theta[i + 1] - cos_theta[i]
+    x *= position
+    x += cos_theta[i]
+    x *= _longitude(ra_deg, center_ra)
+    x *= 2.0 * np.sqrt(2.0) / np.pi
+    y = sin_theta[i + 1] - sin_theta[i]
+    y *= position
+    y += sin_theta[i]
+    y *= np.sqrt(2.0)
+    return x, y
+
+
+def aitoff(ra_deg, dec_deg, center_ra=0.0):
+    """Aitoff (x, y) for RA/Dec in degrees, x growing with RA."""
+    half_lam = _longitude(ra_deg, center_ra)
+    half_lam *= 0.5
+    phi = np.radians(np.asarray(dec_deg, dtype=float))
+    cos_phi = np.cos(phi)
+    alpha = np.cos(half_lam)
+    alpha *= cos_phi
+    np.clip(alpha, -1.0, 1.0, out=alpha)
+    np.arccos(alpha, out=alpha)
+    # 1 / sinc(alpha), with the removable singularity at alpha = 0
+    scale = np.sin(alpha)
+    small = scale < 1e-12
+    scale[small] = 1.0
+    np.divide(alpha, scale, out=scale)
+    scale[small] = 1.0
+    x = np.sin(half_lam, out=half_lam)
+    x *= cos_phi
+    x *= scale
+    x *= 2.0
+    y = np.sin(phi, out=phi)
+    y *= scale
+    return x, y
+
+
+PROJECTIONS = {"mollweide": mollweide, "aitoff": aitoff}
+
+
+def project_to_pixels(ra_deg, dec_deg, width, height, projection="mollweide", center_ra=0.0):
+    """
+    Flat pixel index (row * width + col) of each point on a width x height
+    raster covering the whole projection. Row 0 is the top (north); RA
+    increases to the left, as on a sky chart.
+    """
+    x, y = PROJECTIONS[projection](ra_deg, dec_deg, center_ra)
+    xmax, ymax = BOUNDS[projection]
+    # col = (1 - x / xmax) / 2 * width, computed in place
+    x *= -width / (2.0 * xmax)
+    x += width / 2.0
+    y *= -height / (2.0 * ymax)
+    y += height / 2.0
+    col = np.clip(x.astype(np.int64), 0, width - 1)
+    row = np.clip(y.astype(np.int64), 0, height - 1)
+    row *= width
+    row += col
+    return row
+
+
+class SkyRasterizer:
+    """
+    Accumulates points into a (height, width) density raster.
+
+    add() takes one chunk of RA/Dec (and optional weights); add_chunks()
+    consumes any iterable of chunks. The raster is float64 counts in image
+    order (row 0 = north).
+    """
+
+    def __init__(self, width=1600, height=800, projection="mollweide", center_ra=0.0):
+        if projection not in PROJECTIONS:
+            raise ValueError(f"projection must be one of {', '.join(PROJECTIONS)}")
+        self.width, self.height = width, height
+        self.projection = projection
+        self.center_ra = center_ra
+        self.counts = np.zeros(width * height)
+        self.n_points = 0
+
+    @property
+    def image(self):
+        return self.counts.reshape(self.height, self.width)
+
+    def add(self, ra_deg, dec_deg, weights=None):
+        pixels = project_to_pixels(ra_deg, dec_deg, self.width, self.height,
+                                   self.projection, self.center_ra)
+        self.counts += np.bincount(pixels, weights=weights, minlength=self.counts.size)
+        self.n_points += len(pixels)
+        return self
+
+    def add_chunks(self, chunks):
+        """chunks yields (ra, dec) or (ra, dec, weights) tuples."""
+        for chunk in chunks:
+            self.add(*chunk)
+        return self
+
+
+def iter_radec_chunks(ra_deg, dec_deg, chunk_size=4_000_000):
+    """Chunks of (possibly memory-mapped) RA/Dec columns."""
+    for start in range(0, len(ra_deg), chunk_size):
+        yield (np.asarray(ra_deg[start:start + chunk_size]),
+               np.asarray(dec_deg[start:start + chunk_size]))
+
+
+def galactic_to_equatorial(l_deg, b_deg):
+    """Galactic (l, b) to equatorial (RA, Dec) in degrees (J2000)."""
+    ra_p, dec_p = np.radians(GALACTIC_POLE)
+    l, b = np.radians(l_deg), np.radians(b_deg)
+    l_ncp = np.radians(GALACTIC_L_NCP)
+    sin_dec = np.sin(dec_p) * np.sin(b) + np.cos(dec_p) * np.cos(b) * np.cos(l_ncp - l)
+    y = np.cos(b) * np.sin(l_ncp - l)
+    x = np.cos(dec_p) * np.sin(b) - np.sin(dec_p) * np.cos(b) * np.cos(l_ncp - l)
+    ra = (np.degrees(ra_p + np.arctan2(y, x))) % 360.0
+    return ra, np.degrees(np.arcsin(np.clip(sin_dec, -1.0, 1.0)))
+
+
+def mock_sky_chunks(n, chunk_size=4_000_000, disk_fraction=0.7, scale_height=8.0, seed=None):
+    """
+    n mock sources in chunks: a galactic disk (|b| exponential with
+    scale_height degrees) on top of a uniform sky. Each chunk has its own RNG
+    stream spawned from seed.
+    """
+    n_chunks = -(-n // chunk_size)
+    for i, stream in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        rng = np.random.default_rng(stream)
+        size = min(chunk_size, n - i * chunk_size)
+        l = rng.uniform(0.0, 360.0, size)
+        uniform_b = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, size)))
+        disk_b = np.clip(rng.laplace(0.0, scale_height, size), -90.0, 90.0)
+        b = np.where(rng.random(size) < disk_fraction, disk_b, uniform_b)
+        yield galactic_to_equatorial(l, b)
+
+
+def boundary(projection="mollweide", n=361):
+    """Outline of the projected sphere in the raster's (x, y) axes."""
+    dec = np.linspace(-90.0, 90.0, n)
+    x, y = PROJECTIONS[projection](np.full(n, 179.999999), dec)
+    return np.concatenate([-x, x[::-1]]), np.concatenate([y, y[::-1]])
+
+
+def render(image, projection="mollweide", ax=None, log=True, cmap="magma", title=None):
+    """
+    Show a density raster with one imshow in native projection coordinates
+    (RA increasing to the left), with the sky outline. Returns the AxesImage.
+    """
+    import matplotlib.pyplot as plt
+    if ax is None:
+        _, ax = plt.subplots(figsize=(12, 6))
+    xmax, ymax = BOUNDS[projection]
+    data = np.log10(1.0 + image) if log else image
+    artist = ax.imshow(data, extent=(xmax, -xmax, -ymax, ymax), origin="upper", cmap=cmap,
+                       interpolation="nearest", interpolation_stage="data")
+    bx, by = boundary(projection)
+    ax.plot(-bx, by, color="gray", lw=0.8)  # the x axis is flipped, so mirror the outline
+    ax.set_xlim(xmax, -xmax)
+    ax.set_ylim(-ymax, ymax)
+    ax.set_aspect("equal")
+    ax.set_axis_off()
+    ax.set_facecolor("black")
+    if title:
+        ax.set_title(title)
+    return artist
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render an all-sky density map.")
+    parser.add_argument("--points", type=int, default=10_000_000, help="number of mock sources")
+    parser.add_argument("--catalog", help="binary catalog (catalog_store) or galaxies CSV instead of mock data")
+    parser.add_argument("--projection", choices=sorted(PROJECTIONS), default="mollweide")
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--chunk-size", type=int, default=4_000_000)
+    parser.add_argument("--output", help="save the figure here instead of showing it")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.output:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    raster = SkyRasterizer(args.width, args.height, args.projection)
+    if args.catalog:
+        if args.catalog.endswith(".csv"):
+            from galaxy_catalog import load_galaxies
+            catalog = load_galaxies(args.catalog)
+        else:
+            from catalog_store import BinaryCatalog
+            catalog = BinaryCatalog(args.catalog)
+        chunks = iter_radec_chunks(catalog.ra, catalog.dec, args.chunk_size)
+        label = args.catalog
+    else:
+        chunks = mock_sky_chunks(args.points, args.chunk_size, seed=args.seed)
+        label = f"{args.points:,} mock sources"
+
+    # Time the binning separately from reading / generating the chunks
+    binning = 0.0
+    start = time.perf_counter()
+    for chunk in chunks:
+        chunk_start = time.perf_counter()
+        raster.add(*chunk)
+        binning += time.perf_counter() - chunk_start
+    total = time.perf_counter() - start
+    print(f"Binned {raster.n_points:,} points in {binning:.1f} s "
+          f"({raster.n_points / max(binning, 1e-9) / 1e6:.1f} M points/s), {total:.1f} s with input")
+
+    start = time.perf_counter()
+    render(raster.image, args.projection, title=f"{label} ({args.projection})")
+    if args.output:
+        plt.savefig(args.output, dpi=100, bbox_inches="tight")
+        print(f"Rendered and saved {args.output} in {time.perf_counter() - start:.1f} s")
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-
-def create_star_grid(dim=10, fill_value=0.0, transit_value=1.0):
-    """Create a grid representing a star with a roughly circular illuminated region."""
-    grid = np.ones((dim, dim)) * fill_value  # Background is black
-    
-    # Define the approximate circular region to dim/2 radius
-    center = dim // 2
-    radius = dim // 3  # Adjust to cover ~60% of squares
-    
-    for i in range(dim):
-        for j in range(dim):
-            if (i - center)**2 + (j - center)**2 <= radius**2:
-                grid[i, j] = transit_value  # Bright star region
-    
-    return grid
+from star_raster import create_star_grid
 
 def plot_grids():
     fig, axes = plt.subplots(1, 2, figsize=(10, 5))
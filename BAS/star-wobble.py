@@ -1,9 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from matplotlib.patches import Circle
+from orbits import orbit_positions, star_offsets
+from radial_velocity import rv_curves
+from scene import Scene, animate
+from system_view import SystemView, red_to_blue
 
-def star_planet_wobble_demo():
+def star_planet_wobble_scene():
     """
     Demonstrates the 'wobble' of a star due to an orbiting planet,
     with the star color fading from red to blue and back
@@ -34,6 +36,13 @@ def star_planet_wobble_demo():
     frames = 200   # frames per orbit
     interval = 50  # ms delay between frames
 
+    # Precompute both orbits for every frame. The planet starts on the -x side
+    # (Omega = pi), so the star starts at (+R_star_orbit, 0).
+    frame_idx = np.arange(frames)
+    planet_rel = orbit_positions(frame_idx, frames, [separation], Omega=np.pi)
+    star_xyz = star_offsets(planet_rel, star_mass, [planet_mass])
+    planet_xyz = planet_rel[:, 0] + star_xyz
+
     # -------------------------
     # FIGURE SETUP
     # -------------------------
@@ -54,79 +63,35 @@ def star_planet_wobble_demo():
     ax.set_yticks([])
     ax.set_title("Star & Planet Wobble (Radial Velocity Demo)", color="white", fontsize=12)
 
-    # Create the star & planet patches
-    # By default, start the star as red:
-    star_patch = Circle((R_star_orbit, 0), star_radius, color="white", zorder=2)
-    planet_patch = Circle((-R_planet_orbit, 0), planet_radius, color="white", zorder=3)
-    ax.add_patch(star_patch)
-    ax.add_patch(planet_patch)
+    # Star & planet in one collection; the planet is drawn on top of the star
+    bodies = SystemView(ax, [star_radius, planet_radius], "white")
 
-    # -------------------------
-    # HELPER: COLOR INTERPOLATION
-    # -------------------------
-    def red_to_blue(fraction):
-        """
-        Interpolate from red (1,0,0) to blue (0,0,1) with fraction in [0..1].
-        Returns an (r,g,b) tuple.
-        """
-        r = 1 - fraction
-        g = 0
-        b = fraction
-        return (r, g, b)
-
-    def blue_to_red(fraction):
-        """
-        Interpolate from blue (0,0,1) to red (1,0,0) with fraction in [0..1].
-        Returns an (r,g,b) tuple.
-        """
-        r = fraction
-        g = 0
-        b = 1 - fraction
-        return (r, g, b)
+    # ----- Doppler color shift for the star -----
+    # Line-of-sight velocity of the star for every frame (observer below the
+    # figure, positive = moving away), in the demo's own units. Moving away
+    # (+K) is fully red, moving toward us (-K) is fully blue.
+    star_rv = rv_curves(frame_idx, star_mass, [[planet_mass]], period=frames,
+                        separation=separation, length_unit=1.0, time_unit=1.0)[0]
+    star_colors = red_to_blue(0.5 * (1.0 - star_rv / np.abs(star_rv).max()))
+
+    # Per-frame offsets (frame, body, xy) and colours (the planet stays white)
+    body_offsets = np.stack([star_xyz[:2].T, planet_xyz[:2].T], axis=1)
+    body_colors = np.stack([star_colors, np.ones_like(star_colors)], axis=1)
+    bodies.update(body_offsets[0], body_colors[0])
 
     # -------------------------
     # ANIMATION UPDATE
     # -------------------------
     def update(frame):
-        # fraction of orbit from 0..1
-        frac = frame / frames
-
-        # Star orbit
-        angle = 2.0 * np.pi * frac
-        x_star = R_star_orbit * np.cos(angle)
-        y_star = R_star_orbit * np.sin(angle)
-        star_patch.center = (x_star, y_star)
-
-        # Planet orbit (180° out of phase)
-        x_planet = -R_planet_orbit * np.cos(angle)
-        y_planet = -R_planet_orbit * np.sin(angle)
-        planet_patch.center = (x_planet, y_planet)
-
-        # ----- Doppler color shift for the star -----
-        # We'll fade from red->blue for half the orbit (frac in [0..0.5])
-        # then blue->red for the other half (frac in [0.5..1.0]).
-        if frac <= 0.5:
-            # 0..0.5 => fraction ranges 0..1 => star goes red -> blue
-            alpha = frac / 0.5  # maps [0..0.5] => [0..1]
-            color = red_to_blue(alpha)
-        else:
-            # 0.5..1 => fraction ranges 0..1 => star goes blue -> red
-            alpha = (frac - 0.5) / 0.5  # maps [0.5..1] => [0..1]
-            color = blue_to_red(alpha)
-
-        star_patch.set_facecolor(color)
-
-        return star_patch, planet_patch
-
-    ani = FuncAnimation(
-        fig,
-        update,
-        frames=frames,
-        interval=interval,
-        blit=False,
-        repeat=True
-    )
+        # Star and planet orbit the barycenter 180° out of phase
+        return (bodies.update(body_offsets[frame], body_colors[frame]),)
+
+    return Scene(fig, update, None, frames, interval)
 
+def star_planet_wobble_demo():
+    """Run the star wobble animation in an interactive window."""
+    scene = star_planet_wobble_scene()
+    ani = animate(scene, blit=True)
     plt.show()
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""
+Vectorized star fields, equivalent to initializeStars() in perspective/index.html.
+
+A field is stored as structure-of-arrays columns instead of one object per
+star:
+    x, y   : float32 pixel positions
+    size   : float32 radius in pixels, drawn from RADIUS_MIN..RADIUS_MAX split
+             into four equal ranges with QUARTILE_FRACTIONS of the stars each
+    color  : uint8 index into COLORS (0 = white, 1 = red)
+
+Fields of any size can be generated in fixed-size chunks and streamed to a
+consumer or to disk, and rasterized straight into an image with np.bincount
+instead of drawing one arc per star.
+"""
+import os
+
+import numpy as np
+
+# Same defaults as the configuration block of index.html
+STAR_COUNT = 4000
+RADIUS_MIN = 0.4
+RADIUS_MAX = 3.0
+QUARTILE_FRACTIONS = (0.40, 0.30, 0.20, 0.10)  # RADIUS_Q1..Q4_PERCENT
+RED_PERCENTAGE = 0.90
+
+COLORS = np.array([
+    [1.0, 1.0, 1.0],   # 0: white
+    [1.0, 0.0, 0.0],   # 1: red
+], dtype=np.float32)
+WHITE, RED = 0, 1
+
+COLUMNS = {"x": np.float32, "y": np.float32, "size": np.float32, "color": np.uint8}
+
+
+def quartile_counts(n, fractions=QUARTILE_FRACTIONS):
+    """Stars per radius range: floor of each fraction, remainder to the last (as in index.html)."""
+    counts = [int(np.floor(f * n)) for f in fractions[:-1]]
+    return counts + [n - sum(counts)]
+
+
+def generate_star_field(n=STAR_COUNT, width=1920, height=1080, rng=None,
+                        radius_min=RADIUS_MIN, radius_max=RADIUS_MAX,
+                        fractions=QUARTILE_FRACTIONS):
+    """Generate one field of n stars as a dict of column arrays (all white)."""
+    rng = np.random.default_rng(rng)
+    edges = np.linspace(radius_min, radius_max, len(fractions) + 1)
+
+    # Which radius range each star falls in, in the same order as the JS loops
+    quartile = np.repeat(np.arange(len(fractions)), quartile_counts(n, fractions))
+    low = edges[quartile]
+    step = edges[1] - edges[0]
+
+    return {
+        "x": (rng.random(n, dtype=np.float32) * width),
+        "y": (rng.random(n, dtype=np.float32) * height),
+        "size": (low + rng.random(n) * step).astype(np.float32),
+        "color": np.full(n, WHITE, dtype=np.uint8),
+    }
+
+
+def turn_red(field, fraction=RED_PERCENTAGE, rng=None):
+    """Mark a random `fraction` of the stars red, in place (the end state of turnStarsRedOneByOne)."""
+    rng = np.random.default_rng(rng)
+    n = len(field["color"])
+    field["color"][rng.permutation(n)[:int(np.floor(fraction * n))]] = RED
+    return field
+
+
+def iter_star_field(n, width=1920, height=1080, chunk_size=1_000_000, seed=None, **kwargs):
+    """
+    Yield a field of n stars in chunks of at most chunk_size stars.
+    Each chunk has its own RNG stream spawned from `seed`, so memory use is
+    bounded by chunk_size no matter how large n is.
+    """
+    n_chunks = -(-n // chunk_size)
+    for i, stream in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        size = min(chunk_size, n - i * chunk_size)
+        yield generate_star_field(size, width, height, rng=np.random.default_rng(stream), **kwargs)
+
+
+def write_star_field(directory, n, width=1920, height=1080, chunk_size=1_000_000, seed=None, **kwargs):
+    """
+    Stream a field of n stars to one .npy file per column in `directory`.
+    The files are preallocated with open_memmap and filled chunk by chunk.
+    """
+    os.makedirs(directory, exist_ok=True)
+    columns = {name: np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"),
+                                               mode="w+", dtype=dtype, shape=(n,))
+               for name, dtype in COLUMNS.items()}
+    start = 0
+    for chunk in iter_star_field(n, width, height, chunk_size, seed, **kwargs):
+        stop = start + len(chunk["x"])
+        for name, column in columns.items():
+            column[start:stop] = chunk[name]
+        start = stop
+    for column in columns.values():
+        column.flush()
+    return n
+
+
+def load_star_field(directory, mmap_mode="r"):
+    """Open a field written by write_star_field (memory-mapped by default)."""
+    return {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in COLUMNS}
+
+
+def iter_chunks(field, chunk_size=1_000_000):
+    """Split a (possibly memory-mapped) field into column chunks."""
+    n = len(field["x"])
+    for start in range(0, n, chunk_size):
+        yield {name: np.asarray(column[start:start + chunk_size]) for name, column in field.items()}
+
+
+def rasterize(chunks, width=1920, height=1080, image=None):
+    """
+    Accumulate stars into a (height, width, 3) float32 image.
+
+    `chunks` is one field dict or an iterable of them (e.g. iter_star_field).
+    Each star deposits its disk area (pi * size^2) split bilinearly over the
+    four nearest pixels, one np.bincount per colour, so the cost is a few
+    array passes per chunk instead of one draw call per star.
+    """
+    if isinstance(chunks, dict):
+        chunks = [chunks]
+    if image is None:
+        image = np.zeros((height, width, 3), dtype=np.float32)
+    n_pixels = width * height
+    per_color = np.zeros((len(COLORS), n_pixels))
+
+    for chunk in chunks:
+        x = np.asarray(chunk["x"], dtype=np.float64) - 0.5
+        y = np.asarray(chunk["y"], dtype=np.float64) - 0.5
+        flux = np.pi * np.asarray(chunk["size"], dtype=np.float64) ** 2
+        color = np.asarray(chunk["color"])
+        x0, y0 = np.floor(x), np.floor(y)
+        fx, fy = x - x0, y - y0
+        x0, y0 = x0.astype(np.int64), y0.astype(np.int64)
+
+        for dx, dy, weight in ((0, 0, (1 - fx) * (1 - fy)), (1, 0, fx * (1 - fy)),
+                               (0, 1, (1 - fx) * fy), (1, 1, fx * fy)):
+            px, py = x0 + dx, y0 + dy
+            inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pixel = (py * width + px)[inside]
+            w = (flux * weight)[inside]
+            c = color[inside]
+            for index in range(len(COLORS)):
+                selected = c == index
+                per_color[index] += np.bincount(pixel[selected], weights=w[selected],
+                                                minlength=n_pixels)
+
+    image += np.einsum("cp,ck->pk", per_color, COLORS).reshape(height, width, 3).astype(np.float32)
+    return image
+
+
+def to_uint8(image, gain=1.0):
+    """Clip an accumulated image to displayable 8-bit RGB."""
+    return (np.clip(image * gain, 0.0, 1.0) * 255).astype(np.uint8)
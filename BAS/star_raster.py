@@ -0,0 +1,54 @@
+import numpy as np
+from functools import lru_cache
+
+
+def disk_mask(dim, center=None, radius=None):
+    """
+    Boolean mask of the stellar disk on a dim x dim grid.
+
+    Defaults match the original create_star_grid: center = dim // 2 and
+    radius = dim // 3 (about 60% of the squares at dim=10). center may be a
+    scalar or a (row, col) sequence. Masks are cached on (dim, center, radius)
+    and returned read-only, so never modify them.
+    """
+    if np.ndim(center) > 0:
+        center = tuple(center)  # lists and arrays are not hashable cache keys
+    return _disk_mask(dim, center, radius)
+
+
+@lru_cache(maxsize=32)
+def _disk_mask(dim, center, radius):
+    if center is None:
+        center = dim // 2
+    if radius is None:
+        radius = dim // 3
+    if np.ndim(center) == 0:
+        center = (center, center)
+    cy, cx = center
+
+    # Broadcast a column of row offsets against a row of column offsets
+    rows = (np.arange(dim) - cy) ** 2
+    cols = (np.arange(dim) - cx) ** 2
+    mask = rows[:, None] + cols[None, :] <= radius ** 2
+
+    mask.flags.writeable = False
+    return mask
+
+
+def create_star_grid(dim=10, fill_value=0.0, transit_value=1.0,
+                     center=None, radius=None, out=None):
+    """
+    Create a grid representing a star with a roughly circular illuminated region.
+
+    Pass a preallocated (dim, dim) array as `out` to refill it in place, so
+    animation loops can change the brightness every frame without allocating.
+    """
+    mask = disk_mask(dim, center, radius)
+    if out is None:
+        out = np.empty((dim, dim))
+    elif out.shape != mask.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {mask.shape}")
+
+    out.fill(fill_value)                           # Background
+    np.copyto(out, transit_value, where=mask)      # Star (or transit) region
+    return out
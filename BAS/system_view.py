@@ -0,0 +1,160 @@
+"""
+Collection-based rendering of star + planet systems.
+
+SystemView draws every body of a scene (stars and planets of any number of
+systems) as one EllipseCollection in data units, so a frame is a single
+set_offsets / set_facecolor from NumPy arrays and a single artist to blit,
+however many bodies there are. Bodies are drawn in array order; pass a depth
+per body to update() to draw the nearer ones on top.
+
+multi_system_scene() animates a grid of wobbling stars with their planets,
+built on orbits.orbit_positions / star_offsets and radial_velocity.rv_curves
+for all systems at once.
+
+Example:
+    python system_view.py --systems 36 --planets 8
+"""
+import argparse
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import EllipseCollection
+
+from orbits import orbit_positions, star_offsets
+from radial_velocity import rv_curves
+from scene import Scene, animate
+
+
+class SystemView:
+    """
+    All bodies of a scene as one collection.
+
+    radii  : (n,) body radii in data units
+    colors : one color for all bodies or (n,) colors
+    """
+
+    def __init__(self, ax, radii, colors="white", zorder=2, **kwargs):
+        radii = np.asarray(radii, dtype=float)
+        self.diameters = 2.0 * radii
+        self.collection = EllipseCollection(
+            self.diameters, self.diameters, np.zeros_like(radii), units="xy",
+            offsets=np.zeros((len(radii), 2)), offset_transform=ax.transData,
+            zorder=zorder, linewidths=0, **kwargs)
+        self.collection.set_facecolor(colors)
+        ax.add_collection(self.collection)
+        self._colors = self.collection.get_facecolor()
+
+    def __len__(self):
+        return len(self.diameters)
+
+    def update(self, offsets, colors=None, depth=None):
+        """
+        offsets : (n, 2) body centers
+        colors  : optional (n, 3) or (n, 4) colors; the previous ones are kept otherwise
+        depth   : optional (n,) values; bodies with larger depth are drawn on top
+        Returns the collection, for the animation's list of changed artists.
+        """
+        if colors is not None:
+            self._colors = colors
+        # Offsets, sizes and colors stay in body order; the draw order is
+        # reapplied on every call (the identity without depth)
+        order = slice(None) if depth is None else np.argsort(depth, kind="stable")
+        self.collection.set_offsets(np.asarray(offsets)[order])
+        self.collection.set_widths(self.diameters[order])
+        self.collection.set_heights(self.diameters[order])
+        if len(self._colors) > 1:
+            self.collection.set_facecolor(np.asarray(self._colors)[order])
+        elif colors is not None:
+            self.collection.set_facecolor(colors)
+        return self.collection
+
+
+def red_to_blue(fraction):
+    """
+    Interpolate from red (1,0,0) to blue (0,0,1) with fraction in [0..1].
+    Works on arrays; returns one (r,g,b) row per fraction.
+    """
+    fraction = np.asarray(fraction, dtype=float)
+    return np.stack([1 - fraction, np.zeros_like(fraction), fraction], axis=-1)
+
+
+# -------------------------
+# MULTI-SYSTEM DEMO
+# -------------------------
+def multi_system_scene(n_systems=36, n_planets=8, frames=360, interval=16, seed=0):
+    """
+    A grid of n_systems stars, each with n_planets planets on face-on
+    circular orbits. Stars wobble about their barycenters and are coloured by
+    their line-of-sight velocity (observer below the figure), as in
+    star-wobble.py. Periods divide `frames`, so the animation loops seamlessly.
+    """
+    rng = np.random.default_rng(seed)
+    columns = int(np.ceil(np.sqrt(n_systems)))
+    rows = -(-n_systems // columns)
+    centers = np.stack([np.arange(n_systems) % columns, -(np.arange(n_systems) // columns)], axis=-1) * 2.0
+
+    # Orbits in each system between 0.3 and 0.9 of the cell half-width;
+    # closer planets go round more often (about a^-1.5 orbits per loop, as Kepler's third law)
+    a = np.sort(rng.uniform(0.3, 0.9, (n_systems, n_planets)), axis=-1)
+    orbits_per_loop = np.maximum(1, np.rint(a ** -1.5)).astype(int)
+    period = frames / orbits_per_loop
+    planet_mass = rng.uniform(0.02, 0.15, (n_systems, n_planets))
+    star_mass = np.ones(n_systems)
+
+    frame_idx = np.arange(frames)
+    t_peri = rng.uniform(0, frames, (n_systems, n_planets))
+    planet_rel = orbit_positions(frame_idx, period, a, t_peri=t_peri)
+    star_xyz = star_offsets(planet_rel, star_mass, planet_mass)              # (3, n_systems, frames)
+    planet_xyz = planet_rel + star_xyz[:, :, None, :]                        # (3, n_systems, n_planets, frames)
+
+    # (frames, n_bodies, 2) offsets: stars first, then all planets
+    star_xy = star_xyz[:2].transpose(2, 1, 0) + centers
+    planet_xy = planet_xyz[:2].transpose(3, 1, 2, 0) + centers[:, None, :]
+    offsets = np.concatenate([star_xy, planet_xy.reshape(frames, -1, 2)], axis=1)
+
+    # Doppler colours of the stars from their line-of-sight velocity (observer
+    # below, positive = moving away along +y). With the orbits in the sky plane
+    # the star moves along y as -K cos(f), i.e. omega = pi in rv_curves.
+    star_rv = rv_curves(frame_idx, star_mass, planet_mass, period=period, separation=a,
+                        omega=np.pi, t_peri=t_peri, length_unit=1.0, time_unit=1.0)
+    star_colors = red_to_blue(0.5 * (1.0 - star_rv / np.abs(star_rv).max(axis=-1, keepdims=True)))
+    star_colors = star_colors.transpose(1, 0, 2)                              # (frames, n_systems, 3)
+    planet_colors = np.broadcast_to([0.8, 0.8, 0.8], (n_systems * n_planets, 3))
+    colors = np.concatenate([star_colors, np.broadcast_to(planet_colors, (frames,) + planet_colors.shape)], axis=1)
+
+    fig, ax = plt.subplots(figsize=(7, 7 * rows / columns))
+    ax.set_facecolor("black")
+    ax.set_aspect("equal", "box")
+    ax.set_xlim(-1.0, 2.0 * columns - 1.0)
+    ax.set_ylim(-2.0 * rows + 1.0, 1.0)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_title(f"{n_systems} systems, {n_systems * n_planets} planets", color="black", fontsize=12)
+
+    radii = np.concatenate([np.full(n_systems, 0.12), np.full(n_systems * n_planets, 0.03)])
+    view = SystemView(ax, radii, colors[0])
+
+    def update(frame):
+        return (view.update(offsets[frame], colors[frame]),)
+
+    fig.tight_layout()
+    return Scene(fig, update, None, frames, interval)
+
+
+def multi_system_demo(n_systems=36, n_planets=8):
+    """Run the multi-system animation in an interactive window."""
+    scene = multi_system_scene(n_systems, n_planets)
+    ani = animate(scene, blit=True)
+    plt.show()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Animate many wobbling star systems with one collection.")
+    parser.add_argument("--systems", type=int, default=36)
+    parser.add_argument("--planets", type=int, default=8)
+    args = parser.parse_args()
+    multi_system_demo(args.systems, args.planets)
+
+
+if __name__ == "__main__":
+    main()
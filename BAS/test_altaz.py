@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from altaz import AltAzFrame, check_against_astropy, get_frame, night_grid
+
+pytest.importorskip("astropy")
+
+
+@pytest.mark.parametrize("latitude, longitude, date", [
+    (31.96, -111.6, "2025-01-15"),
+    (-30.24, -70.74, "2019-06-20"),
+    (65.0, 140.0, "2024-11-02"),
+])
+def test_agrees_with_astropy(latitude, longitude, date):
+    worst, rms = check_against_astropy(latitude=latitude, longitude=longitude, date=date,
+                                       tolerance_arcsec=2.0)
+    assert worst < 2.0
+    assert rms < 1.0
+
+
+def test_check_raises_when_over_tolerance():
+    with pytest.raises(ValueError, match="exceeds"):
+        check_against_astropy(n_objects=200, n_times=5, tolerance_arcsec=1e-3)
+
+
+def test_sin_altitude_matches_altaz_and_frames_are_cached():
+    times = night_grid("2025-01-15", 7)
+    frame = get_frame(30.0, -110.0, times)
+    assert get_frame(30.0, -110.0, times) is frame
+    ra, dec = np.array([10.0, 200.0]), np.array([5.0, -40.0])
+    altitude, _ = frame.altaz(ra, dec)
+    np.testing.assert_allclose(np.sin(np.radians(altitude)), frame.sin_altitude(ra, dec), atol=1e-9)
+    assert isinstance(frame, AltAzFrame)
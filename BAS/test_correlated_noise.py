@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from correlated_noise import BrightnessNoise, ou_noise, power_law_noise
+
+
+@pytest.mark.parametrize("n", [4, 5, 6, 7, 64, 65, 1001])
+@pytest.mark.parametrize("alpha", [0.0, 1.0, 2.0])
+def test_power_law_noise_has_unit_variance(n, alpha):
+    x = power_law_noise(n, n_streams=20000, alpha=alpha, seed=0)
+    assert x.shape == (20000, n)
+    assert abs(x.var() - 1.0) < 0.03
+
+
+def test_ou_noise_variance_and_lag_one_correlation():
+    tau = 20.0
+    x = ou_noise(200_000, tau, sigma=2.0, n_streams=4, seed=1)
+    assert abs(x.std() / 2.0 - 1.0) < 0.05
+    lag1 = np.mean([np.corrcoef(row[:-1], row[1:])[0, 1] for row in x])
+    assert abs(lag1 - np.exp(-1.0 / tau)) < 0.01
+
+
+def test_brightness_noise_is_seeded_and_in_range():
+    a = BrightnessNoise(n_streams=2, seed=3, chunk=64)
+    b = BrightnessNoise(n_streams=2, seed=3, chunk=64)
+    values = np.array([a.next() for _ in range(200)])
+    np.testing.assert_array_equal(values, [b.next() for _ in range(200)])
+    assert values.min() >= 0.5 and values.max() <= 1.0
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from galaxy_catalog import parse_dec, parse_ra
+
+
+def test_parse_ra_two_and_three_fields():
+    np.testing.assert_allclose(parse_ra(["11 11.2", "00 30"]), [167.8, 7.5])
+    np.testing.assert_allclose(parse_ra(["10 5 3", "7 1 0"]), [151.2625, 105.25])
+
+
+def test_parse_dec_signs():
+    np.testing.assert_allclose(parse_dec(["+28 42", "-00 30", "+ 21 41"]), [28.7, -0.5, 21 + 41 / 60])
+
+
+def test_ragged_rows_raise_and_name_only_bad_rows():
+    with pytest.raises(ValueError, match=r"rows \[1\]: \['7'\]"):
+        parse_ra(["10 5 3", "7"])
+    with pytest.raises(ValueError, match=r"rows \[2\]"):
+        parse_ra(["10 5", "7 3", "1 2 3"])
+
+
+def test_non_numeric_field_raises():
+    with pytest.raises(ValueError, match=r"rows \[1\]"):
+        parse_ra(["10 5", "x 2"])
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+import perspective_server
+from perspective_server import PerspectiveApp, serve
+
+
+@pytest.fixture(scope="module")
+def app():
+    return PerspectiveApp(seed=0)
+
+
+async def _exchange(app, requests):
+    """Send raw requests on one connection; return (status, body) of each response."""
+    started = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(serve(app, port=0, ready=started.set_result))
+    server = await started
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    try:
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            headers = dict(line.lower().split(": ", 1) for line in head[1:] if line)
+            body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((int(head[0].split()[1]), body))
+        responses.append(await reader.read())  # b"" once the server closes the connection
+    finally:
+        writer.close()
+        task.cancel()
+    return responses
+
+
+def run(app, *requests):
+    return asyncio.run(_exchange(app, requests))
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_invalid_content_length_is_a_bad_request(app, length):
+    (status, body), rest = run(app, b"GET / HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert status == 400
+    assert "Content-Length" in json.loads(body)["error"]
+    assert rest == b""
+
+
+def test_oversized_body_is_refused(app):
+    length = str(perspective_server.MAX_BODY + 1).encode()
+    (status, _), rest = run(app, b"GET / HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert status == 413
+    assert rest == b""
+
+
+def test_handler_failure_is_a_500_and_keeps_the_connection(app, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("star field build failed")
+
+    monkeypatch.setattr(perspective_server, "_starfield_response", broken)
+    (failed, body), (ok, _), rest = run(
+        app, b"GET /api/starfield?n=10&seed=1 HTTP/1.1\r\n\r\n",
+        b"GET /api/galaxies?limit=1 HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert failed == 500
+    assert json.loads(body) == {"error": "internal server error"}
+    assert ok == 200
+    assert rest == b""
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from radial_velocity import rv_curves
+
+T = np.linspace(0.0, 20.0, 50)
+
+
+def test_scalar_planet_mass_with_several_stars():
+    star_mass = np.array([0.8, 1.0, 1.2])
+    rv = rv_curves(T, star_mass, 1e-3, period=5.0)
+    assert rv.shape == (3, len(T))
+    expected = rv_curves(T, star_mass, np.full((3, 1), 1e-3), period=5.0)
+    np.testing.assert_allclose(rv, expected)
+
+
+def test_one_dimensional_planet_mass():
+    # One planet per star with several stars, the planets of one star otherwise
+    per_star = rv_curves(T, [0.8, 1.0], [1e-3, 2e-3], period=5.0)
+    np.testing.assert_allclose(per_star, rv_curves(T, [0.8, 1.0], [[1e-3], [2e-3]], period=5.0))
+    one_star = rv_curves(T, 1.0, [1e-3, 2e-3], period=[5.0, 9.0])
+    np.testing.assert_allclose(one_star, rv_curves(T, [1.0], [[1e-3, 2e-3]], period=[[5.0, 9.0]]))
+
+
+def test_mismatched_masses_raise():
+    with pytest.raises(ValueError):
+        rv_curves(T, [0.8, 1.0, 1.2], [1e-3, 2e-3], period=5.0)
@@ -0,0 +1,183 @@
+"""
+Pixel-level synthetic transit image cubes.
+
+A cube is a (time, dim, dim) stack of images: the stellar disk of
+star_raster.create_star_grid with a planet disk, moving along a Keplerian
+orbit from orbits.orbit_positions, blanking the pixels it covers while it is in
+front of the star. Cubes are written frame-chunk by frame-chunk into a
+memory-mapped .npy file, so a cube far larger than RAM (say 10^4 frames at
+1024 x 1024) only ever holds one chunk in memory, and np.load(...,
+mmap_mode="r") reads it back lazily.
+
+aperture_photometry turns a cube back into a light curve. It only reads the
+aperture's bounding box of each frame and sums it with one tensordot per chunk.
+
+Example:
+    python transit_cube.py cube.npy --frames 10000 --dim 1024
+"""
+import argparse
+import time
+
+import numpy as np
+
+from orbits import orbit_positions
+from star_raster import create_star_grid
+
+
+def star_geometry(dim, center=None, radius=None):
+    """(cy, cx, radius) of the stellar disk in pixels, with create_star_grid's defaults."""
+    if center is None:
+        center = dim // 2
+    if radius is None:
+        radius = dim // 3
+    cy, cx = (center, center) if np.ndim(center) == 0 else center
+    return cy, cx, radius
+
+
+def planet_track(t, period=1.0, a=4.0, e=0.0, inc=np.pi / 2, omega=np.pi / 2, t_peri=0.0):
+    """
+    Planet position relative to the star, in stellar radii, for times t.
+    Returns (x, y, in_front). With the default omega = pi / 2 and an edge-on
+    orbit, mid-transit falls at t = t_peri.
+    """
+    x, y, z = orbit_positions(t, period, a, e, inc, omega, 0.0, t_peri)
+    return x, y, z > 0
+
+
+def render_frames(x, y, in_front, dim=256, planet_radius=0.1, center=None, radius=None,
+                  star_value=1.0, fill_value=0.0, out=None):
+    """
+    Render one frame per planet position into an (n, dim, dim) array.
+
+    x, y and planet_radius are in stellar radii (as from planet_track). Every
+    frame starts as a copy of the star grid; the planet then blanks the pixels
+    whose centers fall inside its disk, for all frames of the chunk at once
+    inside a fixed-size box around each planet.
+    """
+    x, y, in_front = np.broadcast_arrays(np.asarray(x, dtype=float),
+                                         np.asarray(y, dtype=float),
+                                         np.asarray(in_front, dtype=bool))
+    n = len(x)
+    if out is None:
+        out = np.empty((n, dim, dim), dtype=np.float32)
+    elif out.shape != (n, dim, dim):
+        raise ValueError(f"out has shape {out.shape}, expected {(n, dim, dim)}")
+
+    cy, cx, r_star = star_geometry(dim, center, radius)
+    out[...] = create_star_grid(dim, fill_value, star_value, center, radius)
+
+    # Planet centers and radius in pixels (rows grow downward, sky y upward)
+    px = cx + x * r_star
+    py = cy - y * r_star
+    r_planet = planet_radius * r_star
+    half = int(np.ceil(r_planet)) + 1
+    offsets = np.arange(-half, half + 1)
+
+    frames = np.flatnonzero(in_front)
+    rows = np.round(py[frames]).astype(np.int64)[:, None, None] + offsets[None, :, None]
+    cols = np.round(px[frames]).astype(np.int64)[:, None, None] + offsets[None, None, :]
+    covered = ((rows - py[frames, None, None]) ** 2 + (cols - px[frames, None, None]) ** 2
+               <= r_planet ** 2)
+    covered &= (rows >= 0) & (rows < dim) & (cols >= 0) & (cols < dim)
+    frame_idx = np.broadcast_to(frames[:, None, None], covered.shape)
+    rows, cols = np.broadcast_to(rows, covered.shape), np.broadcast_to(cols, covered.shape)
+    out[frame_idx[covered], rows[covered], cols[covered]] = fill_value
+    return out
+
+
+def _chunk_frames(dim, dtype, chunk_bytes):
+    return max(1, int(chunk_bytes // (dim * dim * np.dtype(dtype).itemsize)))
+
+
+def write_cube(path, t, dim=256, planet_radius=0.1, period=1.0, a=4.0, e=0.0,
+               inc=np.pi / 2, omega=np.pi / 2, t_peri=0.0, center=None, radius=None,
+               dtype=np.float32, chunk_bytes=256 * 2**20):
+    """
+    Render a transit cube for the times t straight into a .npy file at path.
+
+    The file is preallocated with open_memmap and filled in chunks of about
+    chunk_bytes, so memory use does not grow with the number of frames.
+    Returns the cube as a read-only memory map.
+    """
+    t = np.asarray(t, dtype=float)
+    cube = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(len(t), dim, dim))
+    step = _chunk_frames(dim, dtype, chunk_bytes)
+    buffer = np.empty((min(step, len(t)), dim, dim), dtype=dtype)
+    for start in range(0, len(t), step):
+        stop = min(start + step, len(t))
+        x, y, in_front = planet_track(t[start:stop], period, a, e, inc, omega, t_peri)
+        cube[start:stop] = render_frames(x, y, in_front, dim, planet_radius, center, radius,
+                                         out=buffer[:stop - start])
+    cube.flush()
+    del cube
+    return load_cube(path)
+
+
+def load_cube(path, mmap_mode="r"):
+    """Open a cube written by write_cube (memory-mapped by default)."""
+    return np.load(path, mmap_mode=mmap_mode)
+
+
+def aperture_photometry(cube, center, radius, annulus=None, chunk_bytes=64 * 2**20):
+    """
+    Light curve of a circular aperture (center = (row, col), radius in pixels).
+
+    Only the aperture's bounding box is read from each frame, and each chunk of
+    frames is reduced with one tensordot against the aperture weights. With
+    annulus = (r_in, r_out) the mean sky level per pixel in that ring is
+    subtracted. Returns a float64 array with one flux per frame.
+    """
+    n_frames, height, width = cube.shape
+    cy, cx = center
+    r_outer = radius if annulus is None else max(radius, annulus[1])
+    y0, y1 = max(int(np.floor(cy - r_outer)), 0), min(int(np.ceil(cy + r_outer)) + 1, height)
+    x0, x1 = max(int(np.floor(cx - r_outer)), 0), min(int(np.ceil(cx + r_outer)) + 1, width)
+
+    d2 = (np.arange(y0, y1)[:, None] - cy) ** 2 + (np.arange(x0, x1)[None, :] - cx) ** 2
+    weights = [d2 <= radius ** 2]
+    if annulus is not None:
+        weights.append((d2 >= annulus[0] ** 2) & (d2 <= annulus[1] ** 2))
+    weights = np.stack(weights).astype(np.float64)
+
+    sums = np.empty((n_frames, len(weights)))
+    step = max(1, int(chunk_bytes // ((y1 - y0) * (x1 - x0) * cube.dtype.itemsize)))
+    for start in range(0, n_frames, step):
+        box = np.asarray(cube[start:start + step, y0:y1, x0:x1], dtype=np.float64)
+        sums[start:start + step] = np.tensordot(box, weights, axes=([1, 2], [1, 2]))
+
+    flux = sums[:, 0]
+    if annulus is not None:
+        n_pixels = weights.sum(axis=(1, 2))
+        flux = flux - sums[:, 1] / n_pixels[1] * n_pixels[0]
+    return flux
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a synthetic transit image cube to a .npy file.")
+    parser.add_argument("output")
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--planet-radius", type=float, default=0.1, help="in stellar radii")
+    parser.add_argument("--a", type=float, default=4.0, help="semi-major axis in stellar radii")
+    parser.add_argument("--window", type=float, default=0.2,
+                        help="orbital phase covered, centred on mid-transit")
+    args = parser.parse_args()
+
+    t = np.linspace(-args.window / 2, args.window / 2, args.frames)
+    start = time.perf_counter()
+    cube = write_cube(args.output, t, args.dim, args.planet_radius, a=args.a)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {cube.shape} {cube.dtype} cube ({cube.nbytes / 2**20:.0f} MiB) "
+          f"in {elapsed:.1f} s to {args.output}")
+
+    cy, cx, r_star = star_geometry(args.dim)
+    start = time.perf_counter()
+    flux = aperture_photometry(cube, (cy, cx), r_star + 2)
+    elapsed = time.perf_counter() - start
+    flux = flux / flux.max()
+    print(f"Aperture photometry in {elapsed:.2f} s; transit depth {1.0 - flux.min():.4f} "
+          f"(expected about {args.planet_radius ** 2:.4f})")
+
+
+if __name__ == "__main__":
+    main()
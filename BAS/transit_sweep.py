@@ -0,0 +1,202 @@
+"""
+Monte Carlo transit-depth sweep.
+
+The star-plot scripts and edge-on.py each show a single hand-picked transit
+depth. This samples many planets instead (radius ratio, impact parameter,
+period and photometric noise), builds each phase-folded light curve with
+light_curve.transit_flux, and records the depth, duration and detectability.
+
+Draws are split into chunks that run in a process pool. Every chunk gets its
+own independent RNG stream spawned from one SeedSequence, so results do not
+depend on the number of workers, and each worker writes its chunk straight to
+disk (chunk_000000.npz, or .parquet with pyarrow installed) instead of sending
+it back to the parent. When all chunks are written, sweep.json lists them;
+readers go by that manifest, so stray files in the directory are never mixed
+in. A directory that already holds a sweep is only reused with overwrite=True.
+
+Example:
+    python transit_sweep.py sweep_out --draws 10000000 --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from light_curve import transit_flux
+
+# Sampling ranges: (low, high, log-uniform?)
+DEFAULT_RANGES = {
+    "radius_ratio": (0.01, 0.2, True),   # R_planet / R_star
+    "impact": (0.0, 1.0, False),         # impact parameter in stellar radii
+    "period": (0.5, 100.0, True),        # days
+    "noise": (1e-4, 1e-2, True),         # per-point fractional flux scatter
+}
+
+MANIFEST = "sweep.json"
+
+COLUMNS = ["radius_ratio", "impact", "period", "noise",
+           "depth_true", "depth", "duration", "snr", "detected"]
+
+
+def _sample(rng, n, ranges):
+    draws = {}
+    for name, (low, high, log) in ranges.items():
+        if log:
+            draws[name] = np.exp(rng.uniform(np.log(low), np.log(high), n))
+        else:
+            draws[name] = rng.uniform(low, high, n)
+    return draws
+
+
+def simulate_chunk(rng, n, ranges=DEFAULT_RANGES, n_samples=256, baseline=365.25,
+                   cadence=30.0 / 1440.0, stellar_density=1.0, snr_threshold=7.1):
+    """
+    Simulate n draws and return a dict of column arrays (see COLUMNS).
+
+    baseline and cadence are in days; stellar_density is in solar units and
+    sets a/R_star through Kepler's third law. Each light curve is the transit
+    window of the phase-folded curve, n_samples points wide, with noise scaled
+    by the number of points folded into each sample.
+    """
+    p = _sample(rng, n, ranges)
+    k, b, period, noise = p["radius_ratio"], p["impact"], p["period"], p["noise"]
+
+    # a / R_star for a circular orbit: 215 * (rho / rho_sun)^(1/3) * (P / yr)^(2/3)
+    a_rs = 215.03 * np.cbrt(stellar_density) * (period / 365.25) ** (2.0 / 3.0)
+    sin_i = np.sqrt(1.0 - np.minimum(b / a_rs, 1.0) ** 2)
+    chord = np.sqrt(np.maximum((1.0 + k) ** 2 - b ** 2, 0.0))
+    duration = period / np.pi * np.arcsin(np.minimum(chord / (a_rs * sin_i), 1.0))
+
+    # Time grid around mid-transit, wide enough for the longest possible transit
+    half_window = 0.75 * period / np.pi * np.arcsin(np.minimum((1.0 + k) / a_rs, 1.0))
+    t = np.linspace(-1.0, 1.0, n_samples) * half_window[:, None]
+    phase = 2.0 * np.pi * t / period[:, None]
+    flux = transit_flux(a_rs[:, None] * np.sin(phase), k[:, None],
+                        impact=b[:, None] * np.cos(phase), in_front=np.cos(phase) > 0)
+
+    # Each folded sample averages n_transits * (sample width / cadence) raw points
+    n_transits = np.maximum(np.floor(baseline / period), 1.0)
+    per_sample = np.maximum(n_transits * (2.0 * half_window / n_samples) / cadence, 1.0)
+    sigma = noise / np.sqrt(per_sample)
+    observed = flux + sigma[:, None] * rng.standard_normal(flux.shape)
+
+    # Box depth estimate from the known in-transit samples
+    in_transit = flux < 1.0
+    n_in = in_transit.sum(axis=1)
+    n_out = n_samples - n_in
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_in = np.where(in_transit, observed, 0.0).sum(axis=1) / n_in
+        mean_out = np.where(in_transit, 0.0, observed).sum(axis=1) / n_out
+        depth = np.where(n_in > 0, mean_out - mean_in, 0.0)
+        snr = np.where(n_in > 0, depth / (sigma * np.sqrt(1.0 / n_in + 1.0 / n_out)), 0.0)
+
+    return {
+        "radius_ratio": k, "impact": b, "period": period, "noise": noise,
+        "depth_true": 1.0 - flux.min(axis=1), "depth": depth,
+        "duration": duration, "snr": snr, "detected": snr >= snr_threshold,
+    }
+
+
+def _write_chunk(path, columns, fmt):
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow), "
+                              "or use fmt='npz'") from None
+        pq.write_table(pa.table(columns), path)
+    else:
+        np.savez(path, **columns)
+
+
+def _run_chunk(out_dir, index, n, seed_seq, fmt, kwargs):
+    columns = simulate_chunk(np.random.default_rng(seed_seq), n, **kwargs)
+    _write_chunk(os.path.join(out_dir, f"chunk_{index:06d}.{fmt}"), columns, fmt)
+    return int(columns["detected"].sum())
+
+
+def _existing_sweep_files(out_dir):
+    files = glob.glob(os.path.join(out_dir, "chunk_*.*"))
+    manifest = os.path.join(out_dir, MANIFEST)
+    return files + [manifest] if os.path.exists(manifest) else files
+
+
+def run_sweep(out_dir, draws, chunk_size=20_000, workers=None, seed=None, fmt="npz",
+              overwrite=False, **kwargs):
+    """
+    Run `draws` simulations in chunks across a process pool, writing one file
+    per chunk into out_dir plus the sweep.json manifest. Raises
+    FileExistsError if out_dir already holds a sweep, unless overwrite=True,
+    which deletes its chunks first. Extra keyword arguments go to
+    simulate_chunk. Returns (draws, number detected).
+    """
+    if fmt not in ("npz", "parquet"):
+        raise ValueError("fmt must be 'npz' or 'parquet'")
+    os.makedirs(out_dir, exist_ok=True)
+    old = _existing_sweep_files(out_dir)
+    if old and not overwrite:
+        raise FileExistsError(f"{out_dir} already holds a sweep ({len(old)} files); "
+                              "pass overwrite=True to replace it")
+    for path in old:
+        os.remove(path)
+
+    sizes = [min(chunk_size, draws - start) for start in range(0, draws, chunk_size)]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        detected = sum(pool.map(_run_chunk, [out_dir] * len(sizes), range(len(sizes)), sizes,
+                                streams, [fmt] * len(sizes), [kwargs] * len(sizes)))
+
+    manifest = {"draws": draws, "detected": int(detected), "format": fmt,
+                "chunks": [f"chunk_{index:06d}.{fmt}" for index in range(len(sizes))]}
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return draws, detected
+
+
+def iter_sweep(out_dir):
+    """Yield the chunks listed in a sweep's manifest one at a time as dicts of column arrays."""
+    with open(os.path.join(out_dir, MANIFEST)) as f:
+        chunks = json.load(f)["chunks"]
+    for name in chunks:
+        path = os.path.join(out_dir, name)
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            table = pq.read_table(path)
+            yield {name: table.column(name).to_numpy() for name in table.column_names}
+        else:
+            with np.load(path) as chunk:
+                yield {name: chunk[name] for name in chunk.files}
+
+
+def load_sweep(out_dir, columns=COLUMNS):
+    """Concatenate the requested columns of a sweep (only for results that fit in memory)."""
+    parts = {name: [] for name in columns}
+    for chunk in iter_sweep(out_dir):
+        for name in columns:
+            parts[name].append(chunk[name])
+    return {name: np.concatenate(values) for name, values in parts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo transit-depth yield sweep.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=["npz", "parquet"], default="npz")
+    parser.add_argument("--overwrite", action="store_true", help="replace a sweep already in out_dir")
+    args = parser.parse_args()
+
+    draws, detected = run_sweep(args.out_dir, args.draws, chunk_size=args.chunk_size,
+                                workers=args.workers, seed=args.seed, fmt=args.format,
+                                overwrite=args.overwrite)
+    print(f"{detected} of {draws} simulated transits detected ({detected / draws:.1%})")
+
+
+if __name__ == "__main__":
+    main()